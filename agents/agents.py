@@ -43,7 +43,16 @@ from tools.get_pokemon_profiles import get_pokemon_profiles
 from tools.analyse_pokemon_team import analyse_pokemon_team
 from tools.search_pokemon_by_criteria import search_pokemon_by_criteria
 from tools.search_pokemon_web import search_pokemon_web
-from agents.utils import format_execution_results
+from tools.calculate_damage import calculate_damage
+from tools.find_counters import find_counters
+from tools.cache import TOOL_CACHE, WEB_SEARCH_TTL
+from agents.metrics import instrument_tool, record_prompt_tokens
+from tools.utils import count_cpu
+from agents.utils import (
+    REPORT_RESULTS_TOKEN_BUDGET,
+    count_tokens,
+    format_execution_results,
+)
 
 model = OpenAIModel("gpt-4o")
 thinking_model = OpenAIModel("o3")
@@ -77,6 +86,17 @@ plan_evaluate_agent = Agent(
 MAX_TOOL_RETRIES = 3
 
 
+def instrumented_tool(fn, ttl=None) -> Tool:
+    """Registers a tool behind the shared result cache, timing every call
+    (cache hits included) into the metrics and charging CPU to the calls
+    that actually run the tool.
+    """
+    return Tool(
+        instrument_tool(TOOL_CACHE.wrap(count_cpu(fn), ttl=ttl)),
+        max_retries=MAX_TOOL_RETRIES,
+    )
+
+
 async def toggle_websearch(
     ctx: RunContext[bool], tool_defs: list[ToolDefinition]
 ) -> Union[list[ToolDefinition], None]:
@@ -92,10 +112,12 @@ execute_agent = Agent(
     output_type=ExecutionOutput,
     deps_type=State,
     tools=[
-        Tool(get_pokemon_profiles, max_retries=MAX_TOOL_RETRIES),
-        Tool(analyse_pokemon_team, max_retries=MAX_TOOL_RETRIES),
-        Tool(search_pokemon_by_criteria, max_retries=MAX_TOOL_RETRIES),
-        Tool(search_pokemon_web, max_retries=MAX_TOOL_RETRIES),
+        instrumented_tool(get_pokemon_profiles),
+        instrumented_tool(analyse_pokemon_team),
+        instrumented_tool(search_pokemon_by_criteria),
+        instrumented_tool(search_pokemon_web, ttl=WEB_SEARCH_TTL),
+        instrumented_tool(calculate_damage),
+        instrumented_tool(find_counters),
     ],
     prepare_tools=toggle_websearch,
     retries=1,
@@ -122,11 +144,13 @@ def dynamic_plan_evaluate_prompt(ctx: RunContext[State]) -> str:
     CORE_PROMPT = (
         PLAN_EVALUATE_WEB_PROMPT if ctx.deps.is_search_enabled else PLAN_EVALUATE_PROMPT
     )
-    return CORE_PROMPT.format(
+    prompt = CORE_PROMPT.format(
         user_prompt=ctx.deps.user_prompt,
         research_outline=ctx.deps.research_outline,
         execution_results=format_execution_results(ctx.deps.execution_results),
     )
+    record_prompt_tokens(count_tokens(prompt))
+    return prompt
 
 
 @execute_agent.system_prompt
@@ -137,8 +161,12 @@ def dynamic_execute_prompt(ctx: RunContext[State]) -> str:
 
 @report_agent.system_prompt
 def dynamic_report_prompt(ctx: RunContext[State]) -> str:
-    return REPORT_PROMPT.format(
+    prompt = REPORT_PROMPT.format(
         user_prompt=ctx.deps.user_prompt,
         research_outline=ctx.deps.research_outline,
-        execution_results=format_execution_results(ctx.deps.execution_results),
+        execution_results=format_execution_results(
+            ctx.deps.execution_results, token_budget=REPORT_RESULTS_TOKEN_BUDGET
+        ),
     )
+    record_prompt_tokens(count_tokens(prompt))
+    return prompt
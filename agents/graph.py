@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import math
 from dataclasses import dataclass
 from typing import Union
 
@@ -21,7 +23,9 @@ from agents.agents import (
     report_agent,
 )
 from pydantic_ai.usage import UsageLimits
-from agents.utils import format_execution_error
+from agents.utils import format_execution_error, normalize_query
+from agents.scheduler import EXECUTE_SCHEDULER
+from agents.metrics import instrument_node, record_error, record_usage
 import chainlit as cl
 
 
@@ -65,11 +69,13 @@ import chainlit as cl
 class Outline(BaseNode[State]):
     prompt: str
 
+    @instrument_node
     async def run(self, ctx: GraphRunContext[State]) -> PlanEvaluate:
         step = cl.Step(name="📝 Planning", type="run")
         await step.send()
 
         response = await outline_agent.run(self.prompt, deps=ctx.state)
+        record_usage(response.usage())
         ctx.state.research_outline = response.output.plan
 
         await step.stream_token(f"📋 Plan:\n{ctx.state.research_outline}")
@@ -82,6 +88,7 @@ class Outline(BaseNode[State]):
 class PlanEvaluate(BaseNode[State]):
     max_turns: int = 5
 
+    @instrument_node
     async def run(self, ctx: GraphRunContext[State]) -> Union[Execute, Report]:
         step = cl.Step(name=f"🧠 Thinking", type="run")
         await step.send()
@@ -96,12 +103,16 @@ class PlanEvaluate(BaseNode[State]):
         ctx.state.num_evaluate_turns += 1
 
         response = await plan_evaluate_agent.run(deps=ctx.state)
+        record_usage(response.usage())
         plan: ExecutionPlan = response.output
 
         if plan.thoughts:
             await step.stream_token(f"💭 Thoughts:\n{plan.thoughts}\n")
 
         if plan.is_complete:
+            cancelled = cancel_pending_executions(ctx.state)
+            if cancelled:
+                await step.stream_token(f"🛑 Cancelled {cancelled} stale queries.\n")
             await step.stream_token("✅ Research complete. Generating report...")
             await step.update()
             return Report()
@@ -112,78 +123,154 @@ class PlanEvaluate(BaseNode[State]):
             await step.update()
             return Execute(plan=plan)
 
+        if ctx.state._pending_executions:
+            await step.stream_token("\n⏳ Waiting for running queries.")
+            await step.update()
+            return Execute(plan=plan)
+
         await step.stream_token("⚠️ No queries generated. Ending early.")
         await step.update()
         return Report()
 
 
+def cancel_pending_executions(state: State) -> int:
+    """Cancels queries still running from earlier pipelined steps."""
+    pending = state._pending_executions
+    for task in pending:
+        task.cancel()
+    cancelled = len(pending)
+    pending.clear()
+    return cancelled
+
+
 @dataclass
 class Execute(BaseNode[State]):
     plan: ExecutionPlan
 
+    @instrument_node
     async def run(self, ctx: GraphRunContext[State]) -> PlanEvaluate:
         step = cl.Step(name="🔧 Executing", type="run")
         await step.send()
 
-        queries = self.plan.queries
-        tasks = [
-            execute_agent.run(
+        pending = ctx.state._pending_executions
+
+        # Repeats of earlier answers or of queries still running are skipped,
+        # and near-identical queries in this batch share a single run.
+        answered = {
+            normalize_query(result.query)
+            for result in ctx.state.execution_results
+            if result.is_success
+        }
+        running = {normalize_query(query) for query in pending.values()}
+        unique_queries = {}
+        for query in self.plan.queries:
+            key = normalize_query(query)
+            if key in answered:
+                await step.stream_token(f"\n\n♻️ Already answered: _{query}_")
+            elif key in running:
+                await step.stream_token(f"\n\n⏳ Still running: _{query}_")
+            elif key in unique_queries:
+                await step.stream_token(
+                    f"\n\n♻️ Same as _{unique_queries[key]}_: _{query}_"
+                )
+            else:
+                unique_queries[key] = query
+
+        for position, query in enumerate(unique_queries.values()):
+            run_query = functools.partial(
+                execute_agent.run,
                 query,
                 usage_limits=UsageLimits(request_limit=4),
                 deps=ctx.state,
             )
-            for query in queries
-        ]
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for query, response in zip(queries, responses):
-            if isinstance(response, Exception):
-                print(f"\n\nError executing query '{query}': \n{response}")
-                user_message = format_execution_error(response, query=query)
-
-                ctx.state.execution_results.append(
-                    ExecutionResult(
-                        query=query,
-                        tool_name="Unknown",
-                        tool_output=user_message,
-                        is_success=False,
-                        summary=user_message,
-                    )
-                )
+            task = asyncio.ensure_future(
+                EXECUTE_SCHEDULER.run((ctx.state.started_at, position), run_query)
+            )
+            pending[task] = query
+
+        # Each summary is streamed and recorded as soon as its run finishes.
+        # In pipelined mode planning resumes once enough of the running
+        # queries are done, and the stragglers carry over to later steps.
+        required = max(1, math.ceil(ctx.state.pipeline_fraction * len(pending)))
+        finished = 0
+        while pending and finished < required:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                query = pending.pop(task)
+                finished += 1
+                try:
+                    response = task.result()
+                except (Exception, asyncio.CancelledError) as e:
+                    # A query cancelled from outside fails alone, not the graph.
+                    response = e
+                await self.record(ctx.state, step, query, response)
+
+        if pending:
+            await step.stream_token(
+                f"\n\n⏳ Planning while {len(pending)} queries finish."
+            )
 
-                await step.stream_token(f"\n\n❌ _{query}_")
-                continue
+        await step.update()
+        return PlanEvaluate()
 
-            tool_message = response.all_messages()[2].parts[0]
-            tool_name = tool_message.tool_name
-            tool_output = tool_message.content
-            summary = response.output.summary
+    async def record(self, state: State, step: cl.Step, query: str, response):
+        if isinstance(response, BaseException):
+            print(f"\n\nError executing query '{query}': \n{response}")
+            record_error()
+            user_message = format_execution_error(response, query=query)
 
-            ctx.state.execution_results.append(
+            state.execution_results.append(
                 ExecutionResult(
                     query=query,
-                    tool_name=tool_name,
-                    tool_output=tool_output,
-                    is_success=response.output.is_success,
-                    summary=summary,
+                    tool_name="Unknown",
+                    tool_output=user_message,
+                    is_success=False,
+                    summary=user_message,
                 )
             )
 
-            await step.stream_token(
-                f"\n\n🔍 {tool_name} ran on _{query}_:\n\n{summary}\n"
+            await step.stream_token(f"\n\n❌ _{query}_")
+            return
+
+        record_usage(response.usage())
+        tool_message = response.all_messages()[2].parts[0]
+        tool_name = tool_message.tool_name
+        tool_output = tool_message.content
+        summary = response.output.summary
+
+        state.execution_results.append(
+            ExecutionResult(
+                query=query,
+                tool_name=tool_name,
+                tool_output=tool_output,
+                is_success=response.output.is_success,
+                summary=summary,
             )
+        )
+
+        await step.stream_token(f"\n\n🔍 {tool_name} ran on _{query}_:\n\n{summary}\n")
 
-        await step.update()
-        return PlanEvaluate()
 
 @dataclass
 class Report(BaseNode[State]):
+    @instrument_node
     async def run(self, ctx: GraphRunContext[State]) -> End:
+        cancel_pending_executions(ctx.state)
+
         start_step = cl.Step(name="📊 Generating", type="run")
         await start_step.send()
 
-        response = await report_agent.run(deps=ctx.state)
-        ctx.state.report = response.output
+        # Report tokens are pushed to the final step as the model produces them.
+        final_step = cl.Step(name="✅ Final Report", type="run")
+        await final_step.send()
+
+        chunks = []
+        async with report_agent.run_stream(deps=ctx.state) as response:
+            async for delta in response.stream_text(delta=True):
+                chunks.append(delta)
+                await final_step.stream_token(delta)
+            record_usage(response.usage())
+        ctx.state.report = "".join(chunks)
 
         text_elements = []
         for i, source in enumerate(ctx.state.execution_results):
@@ -198,11 +285,9 @@ class Report(BaseNode[State]):
                 )
 
         source_names = [text_el.name for text_el in text_elements]
-        final_report = response.output + "\n\nSources: " + " ".join(source_names)
+        await final_step.stream_token("\n\nSources: " + " ".join(source_names))
 
-        final_step = cl.Step(name="✅ Final Report", type="run")
-        final_step.output = final_report
         final_step.elements = text_elements
-        await final_step.send()
+        await final_step.update()
 
         return End(data=ctx.state)
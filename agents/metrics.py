@@ -0,0 +1,231 @@
+import bisect
+import functools
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from tools.utils import cpu_meter
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+PROMPT_TOKEN_BUCKETS = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+class Histogram:
+    """Fixed-bucket histogram, of latencies by default; percentiles are
+    interpolated within a bucket.
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS, unit: str = "s"):
+        self.bounds = bounds
+        self.unit = unit
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            f"sum_{self.unit}": self.sum,
+            f"p50_{self.unit}": self.percentile(0.5),
+            f"p95_{self.unit}": self.percentile(0.95),
+            f"p99_{self.unit}": self.percentile(0.99),
+            f"max_{self.unit}": self.max,
+            "buckets": {
+                f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)
+            },
+        }
+
+
+class Series:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.model_requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cpu_s = 0.0
+        self.latency = Histogram()
+        # System prompt size per model request, retries included.
+        self.prompt_tokens = Histogram(PROMPT_TOKEN_BUCKETS, unit="tokens")
+
+    def add_usage(self, usage):
+        self.model_requests += usage.requests
+        self.input_tokens += usage.request_tokens or 0
+        self.output_tokens += usage.response_tokens or 0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "model_requests": self.model_requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cpu_s": self.cpu_s,
+            "latency": self.latency.snapshot(),
+            "prompt_tokens": self.prompt_tokens.snapshot(),
+        }
+
+
+class Metrics:
+    """Wall time, model requests, tokens and errors per graph node and per tool."""
+
+    def __init__(self):
+        self.series: Dict[str, Dict[str, Series]] = defaultdict(
+            lambda: defaultdict(Series)
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            kind: {name: series.snapshot() for name, series in by_name.items()}
+            for kind, by_name in self.series.items()
+        }
+
+    def summary(self) -> str:
+        lines = []
+        for kind, by_name in self.series.items():
+            for name, series in by_name.items():
+                lines.append(
+                    f"{kind}.{name}: {series.calls} calls, "
+                    f"{series.latency.sum:.2f}s total, "
+                    f"p95 {series.latency.percentile(0.95):.2f}s, "
+                    f"{series.model_requests} model requests, "
+                    f"{series.input_tokens}/{series.output_tokens} tokens in/out, "
+                    f"{series.errors} errors"
+                    + (
+                        f", prompt p95 {series.prompt_tokens.percentile(0.95):.0f} tokens"
+                        if series.prompt_tokens.count
+                        else ""
+                    )
+                )
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
+# Metrics of the session whose graph is running, for tools that never see the State.
+_session_metrics: ContextVar[Optional[Metrics]] = ContextVar(
+    "session_metrics", default=None
+)
+
+
+class _Recorder:
+    """Records one timed call into the process-wide and session metrics."""
+
+    def __init__(self, kind: str, name: str, session: Optional[Metrics]):
+        self.targets = [METRICS.series[kind][name]]
+        if session is not None:
+            self.targets.append(session.series[kind][name])
+
+    def add_usage(self, usage):
+        for series in self.targets:
+            series.add_usage(usage)
+
+    def add_error(self):
+        for series in self.targets:
+            series.errors += 1
+
+    def add_prompt_tokens(self, tokens: int):
+        for series in self.targets:
+            series.prompt_tokens.record(tokens)
+
+    def finish(self, elapsed: float, cpu: float = 0.0):
+        for series in self.targets:
+            series.calls += 1
+            series.cpu_s += cpu
+            series.latency.record(elapsed)
+
+
+_node_recorder: ContextVar[Optional[_Recorder]] = ContextVar(
+    "node_recorder", default=None
+)
+
+
+def instrument_node(run):
+    """Wraps a graph node's `run` to time it into the process-wide metrics and
+    the session's `State._metrics`. Tool calls made while it runs are recorded
+    into the same session.
+    """
+
+    @functools.wraps(run)
+    async def instrumented(node, ctx):
+        session = ctx.state._metrics
+        recorder = _Recorder("node", type(node).__name__, session)
+        session_token = _session_metrics.set(session)
+        recorder_token = _node_recorder.set(recorder)
+        start = time.perf_counter()
+        try:
+            return await run(node, ctx)
+        except Exception:
+            recorder.add_error()
+            raise
+        finally:
+            recorder.finish(time.perf_counter() - start)
+            _node_recorder.reset(recorder_token)
+            _session_metrics.reset(session_token)
+
+    return instrumented
+
+
+def record_usage(usage):
+    """Adds an agent run's model requests and tokens to the running node."""
+    recorder = _node_recorder.get()
+    if recorder is not None:
+        recorder.add_usage(usage)
+
+
+def record_prompt_tokens(tokens: int):
+    """Records the size of a system prompt sent by the running node."""
+    recorder = _node_recorder.get()
+    if recorder is not None:
+        recorder.add_prompt_tokens(tokens)
+
+
+def record_error():
+    """Counts a handled failure, such as a failed query, against the running node."""
+    recorder = _node_recorder.get()
+    if recorder is not None:
+        recorder.add_error()
+
+
+def instrument_tool(tool):
+    """Wraps an async tool to record its wall time, CPU time and errors,
+    keeping its signature and docstring for the tool schema.
+
+    CPU time only counts code wrapped in `count_cpu`, so cache hits and
+    coalesced calls record none.
+    """
+
+    @functools.wraps(tool)
+    async def instrumented(*args, **kwargs):
+        recorder = _Recorder("tool", tool.__name__, _session_metrics.get())
+        with cpu_meter() as cpu:
+            start = time.perf_counter()
+            try:
+                return await tool(*args, **kwargs)
+            except Exception:
+                recorder.add_error()
+                raise
+            finally:
+                recorder.finish(time.perf_counter() - start, cpu[0])
+
+    return instrumented
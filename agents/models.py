@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+import time
+
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Any
 from pydantic_ai.messages import ModelMessage
 
+from agents.metrics import Metrics
+
 
 class FollowUpQuestions(BaseModel):
     questions: list[str]
@@ -43,3 +47,9 @@ class State(BaseModel):
     research_outline: str = ""
     execution_results: list[ExecutionResult] = Field(default_factory=list)
     report: str = ""
+    started_at: float = Field(default_factory=time.time)
+    # Fraction of running queries that must finish before planning again;
+    # below 1.0 the rest keep running while the planner works.
+    pipeline_fraction: float = 1.0
+    _pending_executions: dict = PrivateAttr(default_factory=dict)
+    _metrics: Metrics = PrivateAttr(default_factory=Metrics)
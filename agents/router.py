@@ -0,0 +1,152 @@
+import re
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from dataset.utils import load_pokemon_dataset, resolve_pokemon_name
+
+# Questions are lowercased, stripped of trailing punctuation and matched whole,
+# so anything with extra conditions (a game, a team, a comparison) falls
+# through to the research graph. Names are resolved through the alias index.
+_NAME = r"(?P<name>[\w .':♀♂-]+?)"
+
+# The stored matchup columns use the modern type chart, so questions naming a
+# game or generation go to the research graph, which knows the older charts.
+_GAME = re.compile(
+    r"\b(?:red|blue|green|yellow|gold|silver|crystal|ruby|sapphire|emerald|"
+    r"firered|leafgreen|diamond|pearl|platinum|heartgold|soulsilver|black|white|"
+    r"colosseum|xd|x|y|sun|moon|sword|shield|scarlet|violet|arceus|let'?s go|"
+    r"gen(?:eration)? ?(?:\d+|[ivx]+))\b"
+)
+
+STAT_LABELS = {
+    "base_hp": "HP",
+    "base_attack": "Atk",
+    "base_defense": "Def",
+    "base_special_attack": "SpA",
+    "base_special_defense": "SpD",
+    "base_speed": "Spe",
+}
+
+
+def _display(name: str) -> str:
+    return name.replace("-", " ").title()
+
+
+def _types(values) -> str:
+    return ", ".join(value.title() for value in values)
+
+
+def _answer_types(name: str, row: pd.Series) -> str:
+    return f"**{_display(name)}** is {'/'.join(t.title() for t in row['types'])} type."
+
+
+def _answer_weaknesses(name: str, row: pd.Series) -> str:
+    lines = [f"**{_display(name)}** ({'/'.join(t.title() for t in row['types'])})"]
+    if len(row["weak_to_4x"]):
+        lines.append(f"- 4× weak to: {_types(row['weak_to_4x'])}")
+    if len(row["weak_to_2x"]):
+        lines.append(f"- 2× weak to: {_types(row['weak_to_2x'])}")
+    if len(row["immune_to"]):
+        lines.append(f"- Immune to: {_types(row['immune_to'])}")
+    if len(lines) == 1:
+        lines.append("- No weaknesses")
+    return "\n".join(lines)
+
+
+def _answer_resistances(name: str, row: pd.Series) -> str:
+    lines = [f"**{_display(name)}** ({'/'.join(t.title() for t in row['types'])})"]
+    if len(row["resists_4x"]):
+        lines.append(f"- 4× resists: {_types(row['resists_4x'])}")
+    if len(row["resists_2x"]):
+        lines.append(f"- 2× resists: {_types(row['resists_2x'])}")
+    if len(row["immune_to"]):
+        lines.append(f"- Immune to: {_types(row['immune_to'])}")
+    if len(lines) == 1:
+        lines.append("- No resistances")
+    return "\n".join(lines)
+
+
+def _answer_stats(name: str, row: pd.Series) -> str:
+    stats = " · ".join(f"{label} {row[col]}" for col, label in STAT_LABELS.items())
+    total = sum(int(row[col]) for col in STAT_LABELS)
+    return f"**{_display(name)}** base stats: {stats} (total {total})"
+
+
+def _answer_abilities(name: str, row: pd.Series) -> str:
+    abilities = ", ".join(
+        _display(ability["name"]) + (" (hidden)" if ability["is_hidden"] else "")
+        for ability in row["abilities"]
+    )
+    return f"**{_display(name)}** abilities: {abilities}"
+
+
+def _patterns(*patterns: str) -> List[re.Pattern]:
+    return [re.compile(pattern) for pattern in patterns]
+
+
+INTENTS: List[Tuple[List[re.Pattern], Callable[[str, pd.Series], str]]] = [
+    (
+        _patterns(
+            rf"what(?: is|'s| are)?(?: the)? types? (?:is|are|of|does) {_NAME}(?: have)?",
+            rf"what(?: is|'s| are)? {_NAME}(?:'s|s')? types?",
+            rf"{_NAME}(?:'s|s')? types?",
+        ),
+        _answer_types,
+    ),
+    (
+        _patterns(
+            rf"what(?: is|'s| are)?(?: the)? weakness(?:es)? (?:of|for) {_NAME}",
+            rf"what(?: is|'s| are)? {_NAME}(?:'s|s')? weakness(?:es)?",
+            rf"what is {_NAME} weak (?:to|against)",
+            rf"{_NAME}(?:'s|s')? weakness(?:es)?",
+        ),
+        _answer_weaknesses,
+    ),
+    (
+        _patterns(
+            rf"what does {_NAME} resist",
+            rf"what(?: is|'s| are)? {_NAME}(?:'s|s')? resistances?",
+            rf"{_NAME}(?:'s|s')? resistances?",
+        ),
+        _answer_resistances,
+    ),
+    (
+        _patterns(
+            rf"what(?: is|'s| are)?(?: the)? (?:base )?stats? (?:of|for) {_NAME}",
+            rf"what(?: is|'s| are)? {_NAME}(?:'s|s')? (?:base )?stats?",
+            rf"{_NAME}(?:'s|s')? (?:base )?stats?",
+        ),
+        _answer_stats,
+    ),
+    (
+        _patterns(
+            rf"what abilit(?:y|ies) (?:does|can) {_NAME} have",
+            rf"what(?: is|'s| are)? {_NAME}(?:'s|s')? abilit(?:y|ies)",
+            rf"{_NAME}(?:'s|s')? abilit(?:y|ies)",
+        ),
+        _answer_abilities,
+    ),
+]
+
+
+def route_simple_question(question: str) -> Optional[str]:
+    """Answers single-Pokémon lookups (types, weaknesses, resistances, base
+    stats, abilities) straight from the dataset.
+
+    Returns None when the question needs the research graph, including any
+    question that names a game or generation.
+    """
+    text = question.lower().replace("’", "'").strip().rstrip("?!. ")
+    text = " ".join(text.split())
+    if _GAME.search(text):
+        return None
+    for patterns, answer in INTENTS:
+        for pattern in patterns:
+            match = pattern.fullmatch(text)
+            if match is None:
+                continue
+            name = resolve_pokemon_name(match["name"])
+            if name is not None:
+                return answer(name, load_pokemon_dataset().loc[name])
+    return None
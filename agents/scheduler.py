@@ -0,0 +1,95 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+MAX_CONCURRENT_EXECUTIONS = int(os.getenv("MAX_CONCURRENT_EXECUTIONS", "8"))
+WAIT_SAMPLES = 1000
+
+
+class ExecuteScheduler:
+    """Caps how many execute agent runs are in flight across all sessions.
+
+    Waiting runs are started lowest priority first; Execute uses
+    (session start time, plan position), so older sessions drain before newer
+    ones and each plan runs in order.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_EXECUTIONS):
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+        self.submitted = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(not waiter.done() for _, _, waiter in self._queue)
+
+    async def _acquire(self, priority):
+        if self.running < self.max_concurrency and not self.queue_depth:
+            self.running += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation.
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        # Hand the slot straight to the next live waiter, skipping cancelled ones.
+        while self._queue:
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    async def run(self, priority, fn: Callable[[], Awaitable]) -> Any:
+        self.submitted += 1
+        queued_at = time.perf_counter()
+        await self._acquire(priority)
+        self.waits.append(time.perf_counter() - queued_at)
+        try:
+            return await fn()
+        finally:
+            self.completed += 1
+            self._release()
+
+    def percentile(self, q: float) -> float:
+        if not self.waits:
+            return 0.0
+        ordered = sorted(self.waits)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "wait_p50_s": self.percentile(0.5),
+            "wait_p90_s": self.percentile(0.9),
+            "wait_max_s": max(self.waits, default=0.0),
+        }
+
+
+EXECUTE_SCHEDULER = ExecuteScheduler()
+
+
+def scheduler_stats() -> dict:
+    return EXECUTE_SCHEDULER.stats()
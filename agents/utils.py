@@ -1,6 +1,15 @@
+import functools
+import re
+from typing import Optional
+
 from agents.models import ExecutionResult
 from pydantic_ai import format_as_xml
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 from pydantic_ai.exceptions import (
     UsageLimitExceeded,
     UnexpectedModelBehavior,
@@ -8,25 +17,134 @@ from pydantic_ai.exceptions import (
     AgentRunError,
 )
 
+PLAN_RESULTS_TOKEN_BUDGET = 4000
+REPORT_RESULTS_TOKEN_BUDGET = 8000
+KEEP_RECENT_RESULTS = 3
+CONDENSED_SUMMARY_CHARS = 200
+
+
+@functools.cache
+def _encoding():
+    # tiktoken downloads encodings on first use, which can fail offline.
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Exact with tiktoken available, otherwise estimated at 4 characters per token."""
+    encoding = _encoding() if tiktoken is not None else None
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4
 
-def format_execution_results(execution_results: list[ExecutionResult]) -> str:
+
+def _format_results_xml(results: list[dict]) -> str:
     return format_as_xml(
-        {
-            "execution_results": [
-                {
-                    "query": result.query,
-                    "tool_name": result.tool_name,
-                    "summary": result.summary,
-                }
-                for result in execution_results
-            ]
-        },
+        {"execution_results": results},
         include_root_tag=False,
         item_tag="execution_result",
         indent="",
     )
 
 
+def _condense(result: ExecutionResult) -> dict:
+    summary = " ".join(result.summary.split())
+    first_sentence = re.split(r"(?<=[.!?])\s", summary, maxsplit=1)[0]
+    return {
+        "query": result.query,
+        "tool_name": result.tool_name,
+        "summary": first_sentence[:CONDENSED_SUMMARY_CHARS],
+    }
+
+
+def format_execution_results(
+    execution_results: list[ExecutionResult],
+    token_budget: Optional[int] = PLAN_RESULTS_TOKEN_BUDGET,
+) -> str:
+    """Serializes results for a prompt, compacted to fit `token_budget`
+    (uncompacted when it is None).
+
+    The most recent results are kept verbatim, then older successful ones
+    newest first while they fit. The rest are cut to the first sentence of
+    their summary, and if that is still too long the oldest are merged into
+    a single entry listing the queries they answered, with as many of their
+    first sentences as fit. When the recent results alone overflow the
+    budget they are condensed and merged the same way, and the merged query
+    list keeps only its newest queries that fit.
+    """
+    entries = [
+        {
+            "query": result.query,
+            "tool_name": result.tool_name,
+            "summary": result.summary,
+        }
+        for result in execution_results
+    ]
+    formatted = _format_results_xml(entries)
+    if token_budget is None or count_tokens(formatted) <= token_budget:
+        return formatted
+
+    recent_start = max(0, len(entries) - KEEP_RECENT_RESULTS)
+    entries = [
+        entry if i >= recent_start else _condense(result)
+        for i, (entry, result) in enumerate(zip(entries, execution_results))
+    ]
+    for i in range(recent_start, len(entries)):
+        if count_tokens(_format_results_xml(entries[recent_start:])) <= token_budget:
+            break
+        entries[i] = _condense(execution_results[i])
+
+    used = count_tokens(_format_results_xml(entries))
+    for i in reversed(range(recent_start)):
+        result = execution_results[i]
+        if not result.is_success:
+            continue
+        extra = count_tokens(result.summary) - count_tokens(entries[i]["summary"])
+        if used + extra <= token_budget:
+            entries[i] = {**entries[i], "summary": result.summary}
+            used += extra
+
+    merged = 0
+    while used > token_budget and merged < len(entries):
+        merged += 1
+        rolled_up = {
+            "query": "; ".join(r.query for r in execution_results[:merged]),
+            "tool_name": "earlier_results",
+            "summary": f"{merged} earlier results condensed to their queries.",
+        }
+        used = count_tokens(_format_results_xml([rolled_up, *entries[merged:]]))
+
+    if merged:
+        queries = [r.query for r in execution_results[:merged]]
+        while used > token_budget and len(queries) > 1:
+            queries.pop(0)
+            rolled_up["query"] = "; ".join(queries)
+            used = count_tokens(_format_results_xml([rolled_up, *entries[merged:]]))
+
+        # Keep the first sentences of the newest merged findings that still fit.
+        kept = []
+        for result in reversed(execution_results[:merged]):
+            if not result.is_success:
+                continue
+            sentence = _condense(result)["summary"]
+            extra = count_tokens(sentence) + 1
+            if used + extra > token_budget:
+                break
+            kept.insert(0, sentence)
+            used += extra
+        if kept:
+            rolled_up["summary"] = " ".join(kept)
+        entries = [rolled_up, *entries[merged:]]
+    return _format_results_xml(entries)
+
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and whitespace-insensitive key for spotting repeated queries."""
+    return " ".join(re.sub(r"[^\w\s'-]", " ", query.lower()).split())
+
+
 def format_execution_error(exc: Exception, query: str = "") -> str:
     if isinstance(exc, UsageLimitExceeded):
         return (
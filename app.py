@@ -5,13 +5,47 @@ load_dotenv(override=True)
 
 import chainlit as cl
 from agents.models import State
-from agents.graph import Outline, PlanEvaluate, Execute, Report
+from agents.graph import (
+    Outline,
+    PlanEvaluate,
+    Execute,
+    Report,
+    cancel_pending_executions,
+)
 from pydantic_graph import Graph, GraphRunContext
 from agents.agents import clarify_agent, refine_agent, basic_agent
 from agents.models import FollowUpQuestions, RefinedPrompt
+from agents.metrics import METRICS
+from agents.router import route_simple_question
+from agents.scheduler import scheduler_stats
+from tools.cache import tool_cache_stats
+from tools.analyse_pokemon_team import analysis_cache_stats
+from chainlit.server import app as server
 
 graph = Graph(nodes=(Outline, PlanEvaluate, Execute, Report))
 
+# Below 1.0, planning resumes once this fraction of running queries is done.
+PIPELINE_FRACTION = float(os.getenv("PIPELINE_FRACTION", "1.0"))
+
+
+def new_state() -> State:
+    return State(pipeline_fraction=PIPELINE_FRACTION)
+
+
+async def metrics():
+    return {
+        **METRICS.snapshot(),
+        "scheduler": scheduler_stats(),
+        "tool_cache": tool_cache_stats(),
+        "analysis_cache": analysis_cache_stats(),
+    }
+
+
+server.add_api_route("/metrics", metrics, methods=["GET"])
+# Chainlit registered its catch-all frontend route on import, and routes match
+# in order, so move this one ahead of it.
+server.router.routes.insert(0, server.router.routes.pop())
+
 
 @cl.set_chat_profiles
 async def chat_profile():
@@ -66,7 +100,7 @@ async def on_chat_start():
     profile = cl.user_session.get("chat_profile", "Pokedex Deep Research (Web Search)")
     msg = f"👋 Hello! This is {profile}. What can I help you with?"
     await cl.Message(content=msg).send()
-    cl.user_session.set("state", State())
+    cl.user_session.set("state", new_state())
 
 
 @cl.on_message
@@ -79,9 +113,23 @@ async def on_message(msg: cl.Message):
         await cl.Message(content=response.output, author="ChatGPT-4o").send()
         return
 
+    # Single-Pokémon lookups are answered from the dataset, skipping
+    # clarification and research, unless a clarification is under way.
+    if state.num_clarify_turns == 0:
+        answer = route_simple_question(msg.content)
+        if answer is not None:
+            await cl.Message(content=answer, author="Pokédex").send()
+            return
+
     if chat_profile == "Pokedex Deep Research (Web Search)":
         state.is_search_enabled = True
 
     if await run_clarify_turn(msg.content, state):
-        await graph.run(start_node=Outline(prompt=state.user_prompt), state=state)
-        cl.user_session.set("state", State())
+        try:
+            await graph.run(start_node=Outline(prompt=state.user_prompt), state=state)
+        finally:
+            # Queries left running by a failed or abandoned run would keep
+            # holding execute slots that every session shares.
+            cancel_pending_executions(state)
+        print(f"Session metrics:\n{state._metrics.summary()}")
+        cl.user_session.set("state", new_state())
@@ -0,0 +1,131 @@
+"""Measures the build crawler against a local mock PokéAPI at several concurrency limits.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_crawler --synthetic 300 --latency 0.05 \
+        --error-rate 0.02 --throttle-above 24 --concurrency 5 10 20 40
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import dataset.build_dataset as build_dataset
+import dataset.crawler as crawler
+import dataset.utils as dataset_utils
+from benchmarks.mock_pokeapi import (
+    MockPokeApi,
+    add_server_arguments,
+    write_synthetic_dump,
+)
+
+
+def start_server(api: MockPokeApi) -> str:
+    """Runs the mock server on its own event loop thread, so serving does not
+    compete with the crawler being measured.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(api.start(), loop).result()
+
+
+def run_build(base_url: str, concurrency: int) -> dict:
+    workdir = Path(tempfile.mkdtemp())
+    # Start every run cold: no HTTP cache, checkpoint or move table.
+    dataset_utils.HTTP_CACHE.root = workdir / "http_cache"
+    dataset_utils.BASE_URL = build_dataset.BASE_URL = base_url
+
+    start = time.perf_counter()
+    with (
+        contextlib.redirect_stdout(io.StringIO()),
+        contextlib.redirect_stderr(io.StringIO()),
+    ):
+        asyncio.run(
+            build_dataset.fetch_pokemon_profiles(
+                max_concurrency=concurrency,
+                checkpoint_path=workdir / "pokemon.ndjson",
+                failures_path=workdir / "failures.ndjson",
+                moves_path=workdir / "moves.parquet",
+                manifest_path=workdir / "manifest.json",
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    stats = crawler.CRAWL_STATS
+    with open(workdir / "pokemon.ndjson", encoding="utf-8") as f:
+        profiles = sum(1 for _ in f)
+    return {
+        "concurrency": concurrency,
+        "profiles": profiles,
+        "requests": stats.counts["requests"],
+        "wall_s": elapsed,
+        "req_per_s": stats.counts["requests"] / elapsed,
+        "retries": stats.counts["retries"],
+        "429s": stats.counts["status_429"],
+        "5xx": stats.counts["status_5xx"],
+        "failed": stats.counts["failed"],
+        "p50_ms": stats.percentile(0.5) * 1000,
+        "p99_ms": stats.percentile(0.99) * 1000,
+        "final_limit": crawler.LIMITER.limit,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_server_arguments(parser)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument(
+        "--base-delay",
+        type=float,
+        default=crawler.BASE_DELAY,
+        help="First retry backoff in seconds when no Retry-After is given.",
+    )
+    args = parser.parse_args()
+
+    crawler.BASE_DELAY = args.base_delay
+    dump_dir = args.dump_dir or write_synthetic_dump(tempfile.mkdtemp(), args.synthetic)
+    api = MockPokeApi(
+        dump_dir,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        throttle_above=args.throttle_above,
+        retry_after=args.retry_after,
+    )
+    base_url = start_server(api)
+
+    columns = [
+        ("concurrency", 11, "d"),
+        ("profiles", 8, "d"),
+        ("requests", 8, "d"),
+        ("wall_s", 7, ".2f"),
+        ("req_per_s", 9, ".1f"),
+        ("retries", 7, "d"),
+        ("429s", 5, "d"),
+        ("5xx", 5, "d"),
+        ("failed", 6, "d"),
+        ("p50_ms", 7, ".1f"),
+        ("p99_ms", 7, ".1f"),
+        ("final_limit", 11, ".1f"),
+    ]
+    print(
+        f"mock: latency {args.latency}s (+{args.jitter}s jitter), "
+        f"errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%}, "
+        f"throttle above {args.throttle_above}"
+    )
+    print(" ".join(f"{name:>{width}}" for name, width, _ in columns))
+    for concurrency in args.concurrency:
+        result = run_build(base_url, concurrency)
+        print(
+            " ".join(f"{result[name]:>{width}{spec}}" for name, width, spec in columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compares the vectorized damage engine with a per-pair Python loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_damage --defenders 1300 --repeats 20
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from dataset.type_chart import type_matrix
+from tools.calculate_damage import (
+    MIN_ROLL,
+    STAB_MULTIPLIER,
+    damage_range,
+    scale_hp,
+    scale_stat,
+)
+
+
+def synthetic_defenders(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    num_types = type_matrix().shape[0]
+    return {
+        "base_hp": rng.integers(20, 256, n),
+        "base_defense": rng.integers(5, 231, n),
+        "primary": rng.integers(0, num_types, n),
+        # The extra index means "no secondary type".
+        "secondary": rng.integers(0, num_types + 1, n),
+    }
+
+
+def vectorized(defenders, level, power, base_attack, move_type):
+    matrix = type_matrix()
+    attack = scale_stat(base_attack, level)
+    defense = scale_stat(defenders["base_defense"], level)
+    hp = scale_hp(defenders["base_hp"], level)
+    effectiveness = (
+        matrix[move_type, defenders["primary"]],
+        matrix[move_type, defenders["secondary"]],
+    )
+    low, high = damage_range(
+        level, power, attack, defense, STAB_MULTIPLIER, effectiveness
+    )
+    return low / hp, high / hp
+
+
+def looped(defenders, level, power, base_attack, move_type):
+    matrix = type_matrix().tolist()
+    attack = math.floor((2 * base_attack + 31) * level / 100) + 5
+    lows, highs = [], []
+    for base_hp, base_def, t1, t2 in zip(
+        defenders["base_hp"].tolist(),
+        defenders["base_defense"].tolist(),
+        defenders["primary"].tolist(),
+        defenders["secondary"].tolist(),
+    ):
+        defense = math.floor((2 * base_def + 31) * level / 100) + 5
+        hp = math.floor((2 * base_hp + 31) * level / 100) + level + 10
+        base = (
+            math.floor(
+                math.floor(math.floor(2 * level / 5 + 2) * power * attack / defense)
+                / 50
+            )
+            + 2
+        )
+        low, high = math.floor(base * MIN_ROLL), base
+        for multiplier in (
+            STAB_MULTIPLIER,
+            matrix[move_type][t1],
+            matrix[move_type][t2],
+        ):
+            low = math.floor(low * multiplier)
+            high = math.floor(high * multiplier)
+        lows.append(low / hp)
+        highs.append(high / hp)
+    return np.array(lows), np.array(highs)
+
+
+def bench(fn, repeats, *args):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeats, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--defenders", type=int, default=1300)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--level", type=int, default=50)
+    args = parser.parse_args()
+
+    defenders = synthetic_defenders(args.defenders)
+    params = (defenders, args.level, 80, 130, 15)
+
+    vec_time, vec_result = bench(vectorized, args.repeats, *params)
+    loop_time, loop_result = bench(looped, args.repeats, *params)
+
+    assert np.allclose(vec_result[0], loop_result[0])
+    assert np.allclose(vec_result[1], loop_result[1])
+
+    print(f"defenders:  {args.defenders}")
+    print(f"vectorized: {vec_time * 1000:.3f} ms per attacker")
+    print(f"looped:     {loop_time * 1000:.3f} ms per attacker")
+    print(f"speedup:    {loop_time / vec_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
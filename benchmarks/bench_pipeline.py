@@ -0,0 +1,293 @@
+"""Runs the research graph end to end with stub models, measuring orchestration overhead offline.
+
+Every OpenAI model is replaced by a scripted FunctionModel that waits
+`--model-latency` seconds per request, so no network or API key is needed.
+The stubs plan `--rounds` rounds of `--queries` queries, and each query
+makes one real tool call against the local dataset. Build
+`resources/pokemon.parquet` first (offline from a PokéAPI dump with
+`fetch_pokemon_profiles(dump_dir=...)`). Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --sessions 40 --concurrency 8 \
+        --model-latency 0.2 --rounds 2 --queries 3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from unittest import mock
+
+# OpenAIModel wants a key when constructed; the stubs never send a request.
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+import chainlit as cl
+from pydantic_ai.messages import (
+    ModelResponse,
+    RetryPromptPart,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_graph import Graph
+
+import agents.agents as agents
+from agents.graph import (
+    Execute,
+    Outline,
+    PlanEvaluate,
+    Report,
+    cancel_pending_executions,
+)
+from agents.metrics import METRICS
+from agents.models import State
+from agents.scheduler import EXECUTE_SCHEDULER
+from dataset.utils import load_pokemon_dataset
+from tools.cache import TOOL_CACHE, MemoryBackend, tool_cache_stats
+
+PROMPTS = [
+    "Build a team of all bug-type Pokémon.",
+    "What's an easy Pokémon to train in Pokémon Ruby?",
+    "Find a unique Pokémon that lives by the sea.",
+    "What Pokémon should I add next to my party?",
+    "How do I beat the Elite Four in Emerald with Marshtomp?",
+    "Which dragon is the best physical attacker?",
+    "Is Gengar or Alakazam better against Snorlax?",
+    "Which Pokémon counter a Tyranitar and Salamence core?",
+]
+
+# Planner queries and the tool call the execute stub answers each with.
+SCRIPTED_QUERIES = {
+    "Get Gengar's battle profile": (
+        "get_pokemon_profiles",
+        {"names": ["gengar"], "data_groups": ["battle"]},
+    ),
+    "Analyse a team of Gengar, Snorlax and Dragonite": (
+        "analyse_pokemon_team",
+        {"pokemon_names": ["gengar", "snorlax", "dragonite"]},
+    ),
+    "Find Dragon-types": ("search_pokemon_by_criteria", {"include_types": ["dragon"]}),
+    "Damage of Garchomp's Earthquake on Metagross": (
+        "calculate_damage",
+        {"attacker": "garchomp", "move": "earthquake", "defenders": ["metagross"]},
+    ),
+    "Counters for Tyranitar and Salamence": (
+        "find_counters",
+        {"opponents": ["tyranitar", "salamence"]},
+    ),
+    "Get Lapras lore and locations": (
+        "get_pokemon_profiles",
+        {"names": ["lapras"], "data_groups": ["lore", "locations"]},
+    ),
+    "Find Water-types resisting Fire": (
+        "search_pokemon_by_criteria",
+        {"include_types": ["water"], "required_resists": ["fire"]},
+    ),
+    "Analyse a team of Swampert, Skarmory and Blissey": (
+        "analyse_pokemon_team",
+        {"pokemon_names": ["swampert", "skarmory", "blissey"]},
+    ),
+}
+REPORT_TEXT = " ".join(["Scripted report sentence with a few words."] * 40)
+
+
+@dataclass
+class SessionScript:
+    index: int
+    rounds: int
+    queries_per_round: int
+    plan_turns: int = 0
+
+    def queries(self, turn: int):
+        # Sessions start at different offsets, so tool arguments partly overlap.
+        names = list(SCRIPTED_QUERIES)
+        start = self.index + turn * self.queries_per_round
+        return [names[(start + i) % len(names)] for i in range(self.queries_per_round)]
+
+
+_session: ContextVar[SessionScript] = ContextVar("session")
+
+
+class NoOpStep:
+    def __init__(self, *args, **kwargs):
+        self.elements = []
+        self.output = ""
+
+    async def send(self):
+        return self
+
+    async def update(self):
+        return self
+
+    async def stream_token(self, token: str, *args, **kwargs):
+        pass
+
+
+class NoOpText:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _output(info: AgentInfo, **args) -> ModelResponse:
+    return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+
+def stub_models(latency: float) -> list:
+    async def outline(messages, info: AgentInfo):
+        await asyncio.sleep(latency)
+        return _output(info, plan="1. Gather profiles\n2. Compare matchups")
+
+    async def plan_evaluate(messages, info: AgentInfo):
+        await asyncio.sleep(latency)
+        session = _session.get()
+        turn = session.plan_turns
+        session.plan_turns += 1
+        if turn >= session.rounds:
+            return _output(
+                info, thoughts="Enough results.", queries=[], is_complete=True
+            )
+        return _output(
+            info,
+            thoughts=f"Round {turn + 1}.",
+            queries=session.queries(turn),
+            is_complete=False,
+        )
+
+    async def execute(messages, info: AgentInfo):
+        await asyncio.sleep(latency)
+        if len(messages) == 1:
+            query = next(
+                part.content
+                for part in messages[0].parts
+                if isinstance(part, UserPromptPart)
+            )
+            tool_name, args = SCRIPTED_QUERIES[query]
+            return ModelResponse(parts=[ToolCallPart(tool_name, args)])
+        failed = any(isinstance(part, RetryPromptPart) for part in messages[-1].parts)
+        return _output(info, is_success=not failed, summary="Scripted summary.")
+
+    async def report(messages, info: AgentInfo):
+        await asyncio.sleep(latency)
+        for word in REPORT_TEXT.split(" "):
+            yield word + " "
+
+    return [
+        (agents.outline_agent, FunctionModel(outline)),
+        (agents.plan_evaluate_agent, FunctionModel(plan_evaluate)),
+        (agents.execute_agent, FunctionModel(execute)),
+        (agents.report_agent, FunctionModel(stream_function=report)),
+    ]
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run_sessions(args) -> list:
+    graph = Graph(nodes=(Outline, PlanEvaluate, Execute, Report))
+    limiter = asyncio.Semaphore(args.concurrency)
+
+    async def run_session(index: int) -> float:
+        async with limiter:
+            _session.set(SessionScript(index, args.rounds, args.queries))
+            state = State(
+                user_prompt=PROMPTS[index % len(PROMPTS)],
+                pipeline_fraction=args.pipeline_fraction,
+            )
+            start = time.perf_counter()
+            try:
+                await graph.run(Outline(prompt=state.user_prompt), state=state)
+            finally:
+                cancel_pending_executions(state)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(run_session(i) for i in range(args.sessions)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--model-latency", type=float, default=0.2)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--pipeline-fraction", type=float, default=1.0)
+    parser.add_argument(
+        "--max-executions", type=int, default=EXECUTE_SCHEDULER.max_concurrency
+    )
+    parser.add_argument(
+        "--no-tool-cache",
+        action="store_true",
+        help="Recompute every tool call instead of sharing results across sessions.",
+    )
+    args = parser.parse_args()
+
+    EXECUTE_SCHEDULER.max_concurrency = args.max_executions
+    if args.no_tool_cache:
+        TOOL_CACHE.backend = MemoryBackend(maxsize=0)
+    # Load the dataset up front so the first session does not pay for it.
+    load_pokemon_dataset()
+
+    with contextlib.ExitStack() as stack:
+        for agent, model in stub_models(args.model_latency):
+            stack.enter_context(agent.override(model=model))
+        stack.enter_context(mock.patch.object(cl, "Step", NoOpStep))
+        stack.enter_context(mock.patch.object(cl, "Text", NoOpText))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        latencies = asyncio.run(run_sessions(args))
+        wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+    snapshot = METRICS.snapshot()
+    tools = snapshot.get("tool", {})
+    tool_cpu = sum(series["cpu_s"] for series in tools.values())
+    tool_calls = sum(series["calls"] for series in tools.values())
+    cache = tool_cache_stats()
+    hits = sum(stats["hits"] + stats["coalesced"] for stats in cache.values())
+    lookups = hits + sum(stats["misses"] for stats in cache.values())
+
+    print(
+        f"{args.sessions} sessions, {args.concurrency} concurrent, "
+        f"{args.rounds}x{args.queries} queries, {args.model_latency}s per model request"
+    )
+    print(f"wall {wall:.2f}s, {args.sessions / wall:.2f} sessions/s")
+    print(
+        f"session latency p50 {percentile(latencies, 0.5):.2f}s, "
+        f"p95 {percentile(latencies, 0.95):.2f}s, p99 {percentile(latencies, 0.99):.2f}s"
+    )
+    # Tool CPU only counts the tool bodies that ran; the rest also covers the
+    # stub models and the cache, so it bounds the framework cost from above.
+    other_cpu = cpu - tool_cpu
+    print(
+        f"cpu {cpu:.2f}s: tool bodies {tool_cpu:.2f}s over {tool_calls} calls, "
+        f"everything else {other_cpu:.2f}s "
+        f"({other_cpu / args.sessions * 1000:.1f}ms per session)"
+    )
+    print(f"tool cache hit rate {hits / lookups if lookups else 0.0:.0%}")
+    for name, series in snapshot.get("node", {}).items():
+        latency = series["latency"]
+        print(
+            f"  node {name:<13} {series['calls']:>5} calls  "
+            f"p50 {latency['p50_s']:.3f}s  p95 {latency['p95_s']:.3f}s"
+        )
+    for name, series in tools.items():
+        latency = series["latency"]
+        print(
+            f"  tool {name:<26} {series['calls']:>5} calls  "
+            f"p95 {latency['p95_s']:.3f}s  cpu {series['cpu_s']:.3f}s  "
+            f"errors {series['errors']}"
+        )
+    stats = EXECUTE_SCHEDULER.stats()
+    print(
+        f"scheduler max queue depth {stats['max_queue_depth']}, "
+        f"wait p90 {stats['wait_p90_s']:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Serves a local PokéAPI from a static JSON dump with injectable latency and errors.
+
+Run from the repository root, either against a recorded dump (the `data/`
+directory of PokeAPI/api-data) or a synthetic one:
+
+    python -m benchmarks.mock_pokeapi --dump-dir path/to/api-data/data
+    python -m benchmarks.mock_pokeapi --synthetic 300 --latency 0.05 --error-rate 0.02
+
+Then point the build at it by setting `BASE_URL` to the printed address.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from dataset.sources import FileSystemSource
+from dataset.type_chart import fetch_type_chart
+
+VERSION_GROUPS = [
+    "red-blue",
+    "gold-silver",
+    "emerald",
+    "diamond-pearl",
+    "black-white",
+    "x-y",
+    "sun-moon",
+    "sword-shield",
+    "scarlet-violet",
+]
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests"}
+
+
+def _write(root: Path, path: str, body):
+    directory = root / "api/v2" / path
+    directory.mkdir(parents=True, exist_ok=True)
+    with (directory / "index.json").open("w", encoding="utf-8") as f:
+        json.dump(body, f)
+
+
+def _listing(resource: str, names):
+    return {
+        "count": len(names),
+        "results": [
+            {"name": name, "url": f"/api/v2/{resource}/{i}/"}
+            for i, name in enumerate(names, 1)
+        ],
+    }
+
+
+def write_synthetic_dump(root, count: int = 300, moves: int = 60, seed: int = 0):
+    """Writes a PokéAPI-shaped dump of `count` Pokémon in evolution pairs.
+
+    Bodies carry every field get_pokemon_profile reads, with URLs relative to
+    the host as in the official static dump.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    types = list(fetch_type_chart())
+
+    move_names = [f"move-{i}" for i in range(1, moves + 1)]
+    _write(root, "move", _listing("move", move_names))
+    for i, name in enumerate(move_names, 1):
+        damage_class = rng.choice(["physical", "special", "status"])
+        _write(
+            root,
+            f"move/{i}",
+            {
+                "name": name,
+                "type": {"name": rng.choice(types)},
+                "power": None if damage_class == "status" else rng.randrange(40, 130),
+                "damage_class": {"name": damage_class},
+            },
+        )
+
+    names = [f"synthmon-{i}" for i in range(1, count + 1)]
+    _write(root, "pokemon", _listing("pokemon", names))
+    _write(root, "pokemon-species", _listing("pokemon-species", names))
+    for i, name in enumerate(names, 1):
+        chain = (i + 1) // 2
+        groups = rng.sample(VERSION_GROUPS, rng.randint(1, len(VERSION_GROUPS)))
+        _write(
+            root,
+            f"pokemon/{i}",
+            {
+                "id": i,
+                "name": name,
+                "height": rng.randrange(2, 40),
+                "weight": rng.randrange(10, 2000),
+                "base_experience": rng.randrange(40, 300),
+                "species": {"name": name, "url": f"/api/v2/pokemon-species/{i}/"},
+                "location_area_encounters": f"/api/v2/pokemon/{i}/encounters",
+                "types": [
+                    {"slot": slot, "type": {"name": t}}
+                    for slot, t in enumerate(rng.sample(types, rng.randint(1, 2)), 1)
+                ],
+                "stats": [
+                    {"stat": {"name": stat}, "base_stat": rng.randrange(20, 160)}
+                    for stat in STATS
+                ],
+                "abilities": [
+                    {"ability": {"name": "synthetic-ability"}, "is_hidden": False}
+                ],
+                "moves": [
+                    {
+                        "move": {"name": move, "url": f"/api/v2/move/{move[5:]}/"},
+                        "version_group_details": [
+                            {
+                                "version_group": {"name": group},
+                                "move_learn_method": {
+                                    "name": rng.choice(["level-up", "machine", "egg"])
+                                },
+                                "level_learned_at": rng.randrange(1, 60),
+                            }
+                            for group in groups
+                        ],
+                    }
+                    for move in rng.sample(move_names, 12)
+                ],
+            },
+        )
+        _write(
+            root,
+            f"pokemon/{i}/encounters",
+            [
+                {
+                    "location_area": {"name": f"route-{rng.randrange(1, 30)}-area"},
+                    "version_details": [{"version": {"name": "emerald"}}],
+                }
+            ],
+        )
+        _write(
+            root,
+            f"pokemon-species/{i}",
+            {
+                "is_legendary": False,
+                "is_mythical": False,
+                "is_baby": False,
+                "color": {"name": "red"},
+                "shape": {"name": "upright"},
+                "evolves_from_species": (
+                    {"name": names[i - 2]} if i % 2 == 0 else None
+                ),
+                "genera": [{"genus": "Synthetic Pokémon", "language": {"name": "en"}}],
+                "egg_groups": [{"name": "monster"}],
+                "gender_rate": 4,
+                "capture_rate": 45,
+                "growth_rate": {"name": "medium"},
+                "habitat": None,
+                "flavor_text_entries": [
+                    {
+                        "flavor_text": f"Entry for {name}.",
+                        "language": {"name": "en"},
+                        "version": {"name": "emerald"},
+                    }
+                ],
+                "evolution_chain": {"url": f"/api/v2/evolution-chain/{chain}/"},
+            },
+        )
+        if i % 2 == 1:
+            _write(
+                root,
+                f"evolution-chain/{chain}",
+                {
+                    "chain": {
+                        "species": {"name": name},
+                        "evolves_to": [
+                            {
+                                "species": {"name": f"synthmon-{i + 1}"},
+                                "evolution_details": [
+                                    {"trigger": {"name": "level-up"}, "min_level": 16}
+                                ],
+                            }
+                        ],
+                    }
+                },
+            )
+    return root
+
+
+class MockPokeApi:
+    """Minimal HTTP/1.1 server over a PokéAPI dump, for benchmarks.
+
+    Each request waits `latency` seconds (plus up to `jitter`), then fails with
+    a 500 at `error_rate`, or with a 429 carrying `Retry-After` at
+    `rate_limit_rate` or whenever more than `throttle_above` requests are in
+    flight. Bodies get absolute URLs for this server, and ETags so conditional
+    requests can be answered with 304.
+    """
+
+    def __init__(
+        self,
+        dump_dir,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        throttle_above: Optional[int] = None,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        self.source = FileSystemSource(dump_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.throttle_above = throttle_above
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.in_flight = 0
+        self.counts: Dict[int, int] = {}
+        self.server = None
+        self.base = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = await asyncio.start_server(self._handle, host, port)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        self.base = f"http://{host}:{port}"
+        return f"{self.base}/api/v2"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.source.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _respond(self, target: str, headers: Dict[str, str]) -> Tuple:
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+            throttled = (
+                self.throttle_above is not None and self.in_flight > self.throttle_above
+            )
+            if throttled or self.rng.random() < self.rate_limit_rate:
+                return 429, b"", {"Retry-After": f"{self.retry_after:g}"}
+            if self.rng.random() < self.error_rate:
+                return 500, b"", {}
+
+            body, digest = await self.source.fetch(None, urlsplit(target).path)
+            if body is None:
+                return 404, b"", {}
+            etag = f'"{digest}"'
+            if headers.get("if-none-match") == etag:
+                return 304, b"", {"ETag": etag}
+            raw = json.dumps(body).replace('"/api/v2/', f'"{self.base}/api/v2/')
+            return 200, raw.encode("utf-8"), {"ETag": etag}
+        finally:
+            self.in_flight -= 1
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                _, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                status, body, extra = await self._respond(target, headers)
+                self.counts[status] = self.counts.get(status, 0) + 1
+                head = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(body)}",
+                    *(f"{key}: {value}" for key, value in extra.items()),
+                ]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    dump_dir = args.dump_dir
+    if dump_dir is None:
+        dump_dir = write_synthetic_dump(tempfile.mkdtemp(), args.synthetic)
+    api = MockPokeApi(
+        dump_dir,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        throttle_above=args.throttle_above,
+        retry_after=args.retry_after,
+    )
+    base_url = await api.start(args.host, args.port)
+    print(f"Serving {dump_dir} at {base_url}")
+    await api.server.serve_forever()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--dump-dir", default=None)
+    parser.add_argument("--synthetic", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-above", type=int, default=None)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_server_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
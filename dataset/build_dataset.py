@@ -1,36 +1,160 @@
 import asyncio
+import functools
+import hashlib
 import json
+import logging
+import os
+import re
+import resource
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 from tqdm.asyncio import tqdm_asyncio
-from typing import Any, List, Dict, Optional
+from typing import Any, List, Dict, Optional, Set
 from httpx import AsyncClient
-from dataset.utils import fetch_url
-from dataset.type_chart import calculate_type_defenses, calculate_type_offenses
-from collections import defaultdict
+from dataset.crawler import CRAWL_STATS, LIMITER, FetchError, reset_crawler
+from dataset.http_cache import content_hash
+from dataset.utils import (
+    BASE_URL,
+    HTTP_CACHE,
+    RESOURCE_HASHES,
+    fetch_resource,
+    fetch_url,
+    move_slug,
+    set_data_source,
+)
+from dataset.sources import FileSystemSource
+from dataset.type_chart import (
+    calculate_type_defenses,
+    calculate_type_offenses,
+    coverage_from_mask,
+    type_bits,
+)
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataset.utils import (
     derive_overview,
     derive_roles,
     process_evolution_chain,
     process_encounters,
     process_moves,
+    process_move_type_masks,
     process_pokedex_entries,
 )
 
+logger = logging.getLogger(__name__)
+
+_DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+NORMALIZED_TABLES = {
+    "pokemon_moves": pa.schema(
+        [
+            ("pokemon", _DICT_STRING),
+            ("version_group", _DICT_STRING),
+            ("method", _DICT_STRING),
+            ("level", pa.int16()),
+            ("move", _DICT_STRING),
+        ]
+    ),
+    "pokemon_locations": pa.schema(
+        [
+            ("pokemon", _DICT_STRING),
+            ("version", _DICT_STRING),
+            ("location", _DICT_STRING),
+        ]
+    ),
+    "pokemon_lore": pa.schema(
+        [
+            ("pokemon", _DICT_STRING),
+            ("version", _DICT_STRING),
+            ("text", pa.string()),
+        ]
+    ),
+}
+
+DAMAGING_MOVE_CLASSES = {"physical", "special"}
+PARQUET_CHUNK_SIZE = 200
+
+# Per transform function: [calls, seconds], accumulated in whichever process runs it.
+TRANSFORM_TIMINGS: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+
+
+def _timed(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timing = TRANSFORM_TIMINGS[fn.__name__]
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+
+    return wrapper
+
+
+async def get_move(client: AsyncClient, url: str) -> Optional[dict[str, Any]]:
+    move = await fetch_url(client, url)
+    if move is None:
+        return None
+    return {
+        "name": move["name"],
+        "type": move["type"]["name"],
+        "power": move["power"],
+        "damage_class": (
+            move["damage_class"]["name"] if move["damage_class"] else "status"
+        ),
+    }
+
+
+async def fetch_move_table(
+    client: AsyncClient,
+    output_path="resources/moves.parquet",
+) -> pd.DataFrame:
+    data = await fetch_url(client, f"{BASE_URL}/move?limit=2000")
+    print(f"Fetching {len(data['results'])} moves...")
+
+    tasks = [get_move(client, entry["url"]) for entry in data["results"]]
+    moves = [move for move in await tqdm_asyncio.gather(*tasks) if move is not None]
+
+    df = pd.DataFrame(moves).set_index("name")
+    df = df.astype({"type": "category", "damage_class": "category", "power": "Int16"})
+    df.to_parquet(output_path, engine="pyarrow", index=True)
+
+    print(f"Saved {len(df)} moves to {output_path}")
+    return df
 
-async def get_pokemon_profile(client: AsyncClient, name: str) -> dict[str, Any]:
+
+def damaging_move_type_bits(move_table: pd.DataFrame) -> Dict[str, int]:
+    bits = type_bits()
+    damaging = move_table[move_table["damage_class"].isin(DAMAGING_MOVE_CLASSES)]
+    return {
+        name: bits[move_type]
+        for name, move_type in damaging["type"].items()
+        if move_type in bits
+    }
+
+
+async def get_pokemon_profile(
+    client: AsyncClient,
+    name: str,
+    move_type_bits: Optional[Dict[str, int]] = None,
+) -> Optional[dict[str, Any]]:
     name = name.lower()
 
-    pokemon = await fetch_url(client, f"https://pokeapi.co/api/v2/pokemon/{name}")
+    pokemon = await fetch_url(client, f"{BASE_URL}/pokemon/{name}")
+    if pokemon is None:
+        return None
     base_species_name = pokemon["species"]["name"]
-    species = await fetch_url(
-        client, f"https://pokeapi.co/api/v2/pokemon-species/{base_species_name}"
-    )
-    evo_chain_url = species.get("evolution_chain", {}).get("url")
-    evo_chain = (
-        await fetch_url(client, evo_chain_url) if evo_chain_url else {"chain": {}}
-    )
-    encounters = await fetch_url(client, pokemon["location_area_encounters"])
+    species = await fetch_url(client, f"{BASE_URL}/pokemon-species/{base_species_name}")
+    if species is None:
+        raise FetchError(f"species {base_species_name} not found")
+    evo_chain_url = (species.get("evolution_chain") or {}).get("url")
+    evo_chain = await fetch_url(client, evo_chain_url) if evo_chain_url else None
+    evo_chain = evo_chain or {"chain": {}}
+    encounters = await fetch_url(client, pokemon["location_area_encounters"]) or []
 
     types = [
         t["type"]["name"] for t in sorted(pokemon["types"], key=lambda t: t["slot"])
@@ -39,6 +163,10 @@ async def get_pokemon_profile(client: AsyncClient, name: str) -> dict[str, Any]:
     base_stats = {s["stat"]["name"]: s["base_stat"] for s in pokemon["stats"]}
     type_defenses = calculate_type_defenses(types)
     type_offenses = calculate_type_offenses(types)
+    move_type_masks = process_move_type_masks(pokemon["moves"], move_type_bits or {})
+    move_type_mask = 0
+    for mask in move_type_masks.values():
+        move_type_mask |= mask
     battle_overview = derive_overview(base_stats)
 
     abilities = [
@@ -97,6 +225,10 @@ async def get_pokemon_profile(client: AsyncClient, name: str) -> dict[str, Any]:
         "super_effective_against": type_offenses["super_effective_against"],
         "not_very_effective_against": type_offenses["not_very_effective_against"],
         "no_effect_against": type_offenses["no_effect_against"],
+        # Learnset coverage (bitmasks over type chart order)
+        "move_type_mask": move_type_mask,
+        "move_type_masks": move_type_masks,
+        "move_super_effective_against": coverage_from_mask(move_type_mask),
         # Abilities
         "abilities": abilities,
         # Training & Breeding
@@ -122,6 +254,7 @@ def _format_name(s):
     return " ".join(word.capitalize() for word in s.replace("-", " ").split())
 
 
+@_timed
 def _transform_abilities(raw_abilities):
     if not raw_abilities:
         return []
@@ -135,6 +268,7 @@ def _transform_abilities(raw_abilities):
     ]
 
 
+@_timed
 def _transform_evolutions(raw_paths):
     if not raw_paths:
         return []
@@ -144,6 +278,7 @@ def _transform_evolutions(raw_paths):
     ]
 
 
+@_timed
 def _transform_locations_by_game(raw_locations):
     if not raw_locations:
         return {}
@@ -158,6 +293,7 @@ def _transform_locations_by_game(raw_locations):
     return cleaned_data
 
 
+@_timed
 def _transform_pokedex_by_game(raw_entries):
     if not raw_entries:
         return {}
@@ -191,6 +327,7 @@ def _to_level_map(level_up_list):
     return level_map
 
 
+@_timed
 def _transform_moves(moves):
     if not moves:
         return {}
@@ -203,8 +340,7 @@ def _transform_moves(moves):
         level_up_moves = moveset.get("level_up", [])
         sorted_level_up = sorted(level_up_moves, key=lambda m: (m["level"], m["name"]))
         processed_moveset["level_up"] = _to_level_map(sorted_level_up)
-        print(f"Processed {len(sorted_level_up)} level-up moves for {game}")
-        print(processed_moveset["level_up"])
+        logger.debug("Processed %d level-up moves for %s", len(sorted_level_up), game)
         for category in ["egg", "machine", "tutor", "strategic_tags"]:
             move_list = moveset.get(category)
             if isinstance(move_list, list):
@@ -215,6 +351,7 @@ def _transform_moves(moves):
     return transformed_data
 
 
+@_timed
 def format_pokemon_profile(data):
     abilities_formatted = _transform_abilities(data.get("abilities", []))
     evolutions_formatted = _transform_evolutions(data.get("evolution_paths", []))
@@ -283,6 +420,9 @@ def format_pokemon_profile(data):
                     "super_effective_against": data["super_effective_against"],
                     "not_very_effective_against": data["not_very_effective_against"],
                     "no_effect_against": data["no_effect_against"],
+                    "move_super_effective_against": data.get(
+                        "move_super_effective_against", []
+                    ),
                 },
             },
         },
@@ -294,47 +434,531 @@ def format_pokemon_profile(data):
 
 
 async def get_all_pokemon(client: AsyncClient):
-    url = "https://pokeapi.co/api/v2/pokemon?limit=2000"
+    url = f"{BASE_URL}/pokemon?limit=2000"
     data = await fetch_url(client, url)
     return [entry["name"] for entry in data["results"]]
 
 
+# Profiles are dumped with "id" then "name" first, so a checkpoint line's
+# name can usually be read without parsing the rest of the profile.
+_CHECKPOINT_NAME = re.compile(rb'\{(?:"id": -?\d+, )?"name": "([^"\\]*)"')
+
+
+def _checkpoint_name(line: bytes) -> Optional[str]:
+    """Name of the profile on a checkpoint line, or None for a torn line."""
+    if not line.rstrip().endswith(b"}"):
+        return None
+    match = _CHECKPOINT_NAME.match(line)
+    if match:
+        return match.group(1).decode("utf-8")
+    try:
+        return json.loads(line)["name"]
+    except (json.JSONDecodeError, KeyError):
+        return None
+
+
+def checkpoint_names(checkpoint_path) -> Set[str]:
+    """Names of the profiles completed in an NDJSON checkpoint."""
+    names = set()
+    path = Path(checkpoint_path)
+    if not path.exists():
+        return names
+    with path.open("rb") as f:
+        for line in f:
+            name = _checkpoint_name(line)
+            if name is not None:
+                names.add(name)
+    return names
+
+
+def _truncate_partial_line(path):
+    """Drops a line left half-written by a crash, so appends start on a fresh line."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with path.open("rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _compact_checkpoint(checkpoint_path, names: List[str]) -> int:
+    """Rewrites the checkpoint in listing order with one line per profile.
+
+    Only byte offsets are held in memory; lines are copied straight from disk.
+    """
+    path = Path(checkpoint_path)
+    offsets = {}
+    with path.open("rb") as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            name = _checkpoint_name(line)
+            if name is not None:
+                offsets[name] = offset
+
+    tmp = path.with_suffix(".tmp")
+    written = 0
+    with path.open("rb") as src, tmp.open("wb") as dst:
+        for name in names:
+            if name in offsets:
+                src.seek(offsets[name])
+                dst.write(src.readline())
+                written += 1
+    os.replace(tmp, path)
+    return written
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def load_manifest(manifest_path) -> Dict[str, Any]:
+    """Reads the build manifest: content hashes of every profile and of the raw
+    resources it was derived from.
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        return {"move_type_bits": None, "profiles": {}}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest_path, manifest: Dict[str, Any]):
+    path = Path(manifest_path)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+async def _changed_resources(
+    client: AsyncClient, profiles: Dict[str, dict]
+) -> Set[str]:
+    """Revalidates every resource the given profiles were built from, returning
+    the URLs whose content no longer matches the recorded hash.
+    """
+    recorded = {}
+    for entry in profiles.values():
+        recorded.update(entry["resources"])
+
+    async def check(url: str) -> Optional[str]:
+        try:
+            _, digest = await fetch_resource(client, url)
+        except FetchError:
+            # Upstream unreachable: keep the profile built from the old copy.
+            return None
+        return url if digest != recorded[url] else None
+
+    print(f"Revalidating {len(recorded)} resources...")
+    changed = await tqdm_asyncio.gather(*[check(url) for url in recorded])
+    return {url for url in changed if url}
+
+
 async def fetch_pokemon_profiles(
-    json_path="resources/pokemon.json", max_concurrency=20
+    max_concurrency=20,
+    checkpoint_path="resources/pokemon.ndjson",
+    failures_path="resources/pokemon_failures.ndjson",
+    moves_path="resources/moves.parquet",
+    manifest_path="resources/pokemon_manifest.json",
+    refresh=False,
+    dump_dir=None,
+):
+    """Fetches every listed Pokémon profile into the NDJSON checkpoint.
+
+    Profiles already checkpointed are skipped. With `refresh`, the listing and
+    every resource recorded in the manifest are revalidated upstream, and only
+    new Pokémon and profiles built from a changed resource (e.g. every member
+    of a changed evolution chain) are fetched and rebuilt.
+
+    With `dump_dir`, resources are read from a local PokéAPI static JSON dump
+    instead of over HTTP (see dataset.sources.FileSystemSource).
+    """
+    reset_crawler(max_concurrency)
+    if dump_dir is not None:
+        source = FileSystemSource(dump_dir)
+        previous_source = set_data_source(source)
+    try:
+        await _fetch_pokemon_profiles(
+            max_concurrency,
+            checkpoint_path,
+            failures_path,
+            moves_path,
+            manifest_path,
+            refresh,
+        )
+    finally:
+        if dump_dir is not None:
+            set_data_source(previous_source)
+            source.close()
+
+
+async def _fetch_pokemon_profiles(
+    max_concurrency,
+    checkpoint_path,
+    failures_path,
+    moves_path,
+    manifest_path,
+    refresh,
 ):
+    manifest = load_manifest(manifest_path)
+    profile_hashes = manifest["profiles"]
+
     async with AsyncClient(timeout=30.0) as client:
-        names = await get_all_pokemon(client)
-        print(f"Fetching {len(names)} Pokémon profiles...")
+        revalidate = HTTP_CACHE.revalidate
+        HTTP_CACHE.revalidate = revalidate or refresh
+        try:
+            if Path(moves_path).exists() and not refresh:
+                move_table = pd.read_parquet(moves_path)
+            else:
+                move_table = await fetch_move_table(client, output_path=moves_path)
+            names = await get_all_pokemon(client)
+
+            _truncate_partial_line(checkpoint_path)
+            done = checkpoint_names(checkpoint_path)
+            if refresh:
+                changed = await _changed_resources(
+                    client,
+                    {
+                        name: profile_hashes[name]
+                        for name in done & profile_hashes.keys()
+                    },
+                )
+                print(f"{len(changed)} resources changed upstream")
+        finally:
+            HTTP_CACHE.revalidate = revalidate
+
+        move_type_bits = damaging_move_type_bits(move_table)
+        move_type_bits_hash = content_hash(move_type_bits)
+        if refresh:
+            if move_type_bits_hash != manifest["move_type_bits"]:
+                # Move types feed every profile's coverage masks.
+                done = set()
+            done = {
+                name
+                for name in done
+                if name in profile_hashes
+                and not changed & profile_hashes[name]["resources"].keys()
+            }
+        manifest["move_type_bits"] = move_type_bits_hash
+
+        pending = [name for name in names if name not in done]
+        print(
+            f"Fetching {len(pending)} Pokémon profiles "
+            f"({len(names) - len(pending)} already checkpointed)..."
+        )
 
-        semaphore = asyncio.Semaphore(max_concurrency)
-        profiles = {}
+        # Request concurrency is governed by the crawler's adaptive limit; this
+        # only bounds how many half-built profiles are held in memory at once.
+        in_flight = asyncio.Semaphore(2 * max_concurrency)
 
         async def fetch(name: str):
-            async with semaphore:
-                profile = await get_pokemon_profile(client, name)
-                return name, profile
+            async with in_flight:
+                resources = {}
+                RESOURCE_HASHES.set(resources)
+                try:
+                    profile = await get_pokemon_profile(client, name, move_type_bits)
+                    return name, profile, resources, None
+                except Exception as e:
+                    return name, None, resources, repr(e)
+
+        async def fetch_pass(batch: List[str]) -> Dict[str, str]:
+            failures = {}
+            tasks = [fetch(name) for name in batch]
+            with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+                for task in tqdm_asyncio.as_completed(tasks, total=len(tasks)):
+                    name, profile, resources, error = await task
+                    if profile is None:
+                        failures[name] = error or "not found"
+                        continue
+                    checkpoint.write(json.dumps(profile) + "\n")
+                    checkpoint.flush()
+                    profile_hashes[name] = {
+                        "sha256": content_hash(profile),
+                        "resources": resources,
+                    }
+            return failures
+
+        failures = await fetch_pass(pending)
+        if failures:
+            print(f"Retrying {len(failures)} failed profiles...")
+            failures = await fetch_pass(list(failures))
+
+        with open(failures_path, "w", encoding="utf-8") as f:
+            for name, error in failures.items():
+                f.write(json.dumps({"name": name, "error": error}) + "\n")
+        if failures:
+            print(f"{len(failures)} profiles failed, see {failures_path}")
+
+        print(CRAWL_STATS.summary(LIMITER))
+
+    written = _compact_checkpoint(checkpoint_path, names)
+    listed = set(names)
+    manifest["profiles"] = {
+        name: entry for name, entry in profile_hashes.items() if name in listed
+    }
+    _save_manifest(manifest_path, manifest)
+    print(f"Saved {written} profiles to {checkpoint_path}")
+    print(f"Peak RSS: {_peak_rss_mb():.0f} MB")
+
+
+def _iter_line_chunks(ndjson_path, chunk_size: int):
+    chunk = []
+    with open(ndjson_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ordered_pool_map(executor, fn, chunks, window: int):
+    """Like executor.map, but keeps at most `window` chunks in flight so the
+    input file is never read into memory ahead of the workers.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(fn, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _chunk_schema(lines: List[str]) -> tuple[pa.Schema, Dict[str, str]]:
+    profiles = [json.loads(line) for line in lines]
+    hashes = {profile["name"]: content_hash(profile) for profile in profiles}
+    return pa.Table.from_pylist(profiles).schema, hashes
+
+
+def _format_chunk(lines: List[str], schema: pa.Schema, reuse: Set[str]):
+    """Formats one chunk in a worker, skipping profiles in `reuse`.
+
+    Returns the table of formatted rows with their positions in the chunk, the
+    (position, name) of every reused row, and this chunk's transform timings.
+    """
+    TRANSFORM_TIMINGS.clear()
+    formatted, positions, reused = [], [], []
+    for position, line in enumerate(lines):
+        profile = json.loads(line)
+        if profile["name"] in reuse:
+            reused.append((position, profile["name"]))
+            continue
+        profile["full_profile"] = format_pokemon_profile(profile)
+        formatted.append(profile)
+        positions.append(position)
+    table = pa.Table.from_pylist(formatted, schema=schema)
+    return table, positions, reused, dict(TRANSFORM_TIMINGS)
+
+
+def _transform_fingerprint() -> str:
+    # Any change to the transforms in this module invalidates every built row.
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _unified_schema(schemas) -> pa.Schema:
+    """Unifies the Arrow schema of every chunk, so struct columns keyed by game
+    version get every version seen anywhere in the file.
+    """
+    schema = None
+    for chunk_schema in schemas:
+        schema = (
+            chunk_schema
+            if schema is None
+            else pa.unify_schemas([schema, chunk_schema], promote_options="permissive")
+        )
 
-        tasks = [fetch(name) for name in names]
-        for name, profile in await tqdm_asyncio.gather(*tasks):
-            if profile is not None:
-                profiles[name] = profile
+    # Lay columns out as pandas does for a "name" index, so reads restore it.
+    fields = [field for field in schema if field.name != "name"]
+    fields += [pa.field("full_profile", pa.string()), schema.field("name")]
+    index_frame = pd.DataFrame(columns=[field.name for field in fields])
+    pandas_metadata = pa.Schema.from_pandas(index_frame.set_index("name")).metadata
+    return pa.schema(fields, metadata=pandas_metadata)
 
-        with open(json_path, "w") as f:
-            json.dump(profiles, f, indent=2)
 
-        print(f"Saved {len(profiles)} profiles to {json_path}")
+def _previous_build(output_path, fingerprint: str) -> Dict[str, str]:
+    """Profile hashes of the rows in an existing parquet built by the same transforms."""
+    if not Path(output_path).exists():
+        return {}
+    metadata = pq.read_schema(output_path).metadata or {}
+    if metadata.get(b"transform_fingerprint") != fingerprint.encode():
+        return {}
+    return json.loads(metadata.get(b"profile_hashes", b"{}"))
+
+
+def _timing_summary(timings: Dict[str, List[float]]) -> str:
+    lines = ["Transform timings (summed across workers):"]
+    for name, (calls, seconds) in sorted(timings.items(), key=lambda item: -item[1][1]):
+        lines.append(
+            f"  {name:<30} {int(calls):>7} calls {seconds:8.2f}s "
+            f"{1000 * seconds / max(calls, 1):7.3f} ms/call"
+        )
+    return "\n".join(lines)
 
 
 def build_parquet_dataset(
-    json_path="resources/pokemon.json", output_path="resources/pokemon.parquet"
+    ndjson_path="resources/pokemon.ndjson",
+    output_path="resources/pokemon.parquet",
+    chunk_size=PARQUET_CHUNK_SIZE,
+    max_workers=None,
+    incremental=True,
 ):
-    with open(json_path, "r") as f:
-        data = json.load(f)
+    """Builds the parquet dataset from the NDJSON profiles.
+
+    With `incremental`, rows whose raw profile is unchanged since the existing
+    parquet was built by the same transforms are copied over instead of being
+    reformatted.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = 2 * max_workers
+    fingerprint = _transform_fingerprint()
+    previous = _previous_build(output_path, fingerprint) if incremental else {}
+
+    rows = 0
+    timings: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+    tmp_path = f"{output_path}.tmp"
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        hashes = {}
+
+        def chunk_schemas():
+            for chunk_schema, chunk_hashes in _ordered_pool_map(
+                executor,
+                _chunk_schema,
+                _iter_line_chunks(ndjson_path, chunk_size),
+                window,
+            ):
+                hashes.update(chunk_hashes)
+                yield chunk_schema
+
+        schema = _unified_schema(chunk_schemas())
+        schema = schema.with_metadata(
+            {
+                **schema.metadata,
+                b"transform_fingerprint": fingerprint.encode(),
+                b"profile_hashes": json.dumps(hashes).encode(),
+            }
+        )
 
-    for _, profile in data.items():
-        profile["full_profile"] = format_pokemon_profile(profile)
+        reuse = {
+            name for name, digest in hashes.items() if previous.get(name) == digest
+        }
+        old_table, old_rows = None, {}
+        if reuse:
+            old_table = pq.read_table(output_path)
+            old_rows = {name: i for i, name in enumerate(old_table["name"].to_pylist())}
+
+        format_chunk = functools.partial(_format_chunk, schema=schema, reuse=reuse)
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for table, positions, reused, chunk_timings in _ordered_pool_map(
+                executor,
+                format_chunk,
+                _iter_line_chunks(ndjson_path, chunk_size),
+                window,
+            ):
+                if reused:
+                    kept = old_table.take([old_rows[name] for _, name in reused])
+                    # Round-trip through Python so older rows pick up struct
+                    # fields (e.g. new game versions) added since they were built.
+                    kept = pa.Table.from_pylist(kept.to_pylist(), schema=schema)
+                    table = pa.concat_tables([table, kept])
+                    positions = positions + [position for position, _ in reused]
+                    table = table.take(np.argsort(positions, kind="stable"))
+                writer.write_table(table)
+                rows += table.num_rows
+                for name, (calls, seconds) in chunk_timings.items():
+                    timings[name][0] += calls
+                    timings[name][1] += seconds
+    os.replace(tmp_path, output_path)
+
+    print(
+        f"Saved enriched dataset of {rows} Pokémon to {output_path} "
+        f"({rows - len(reuse)} rebuilt, {len(reuse)} unchanged)"
+    )
+    print(_timing_summary(timings))
+    build_normalized_tables(ndjson_path, Path(output_path).parent, chunk_size)
+    print(
+        f"Peak RSS: {_peak_rss_mb():.0f} MB "
+        f"(largest worker: {_peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB)"
+    )
 
-    df = pd.DataFrame(data.values())
-    df.set_index("name", inplace=True)
-    df.to_parquet(output_path, engine="pyarrow", index=True)
-    print(f"Saved enriched dataset to {output_path}")
+
+def _normalized_rows(profile: dict) -> Dict[str, List[dict]]:
+    name = profile["name"]
+    rows = {table: [] for table in NORMALIZED_TABLES}
+
+    for version_group, moveset in (profile.get("moves") or {}).items():
+        for method, moves in (moveset or {}).items():
+            if method == "strategic_tags" or not moves:
+                continue
+            for move in moves:
+                level = move["level"] if method == "level_up" else None
+                move_name = move["name"] if method == "level_up" else move
+                rows["pokemon_moves"].append(
+                    {
+                        "pokemon": name,
+                        "version_group": version_group,
+                        "method": method,
+                        "level": level,
+                        "move": move_slug(move_name),
+                    }
+                )
+
+    # Cleaned the same way as full_profile, so tools can serve either.
+    locations = _transform_locations_by_game(profile.get("encounter_locations"))
+    for version, version_locations in locations.items():
+        for location in version_locations:
+            rows["pokemon_locations"].append(
+                {"pokemon": name, "version": version, "location": location}
+            )
+
+    lore = _transform_pokedex_by_game(profile.get("pokedex_entries"))
+    for version, text in lore.items():
+        if text:
+            rows["pokemon_lore"].append(
+                {"pokemon": name, "version": version, "text": text}
+            )
+    return rows
+
+
+def build_normalized_tables(
+    ndjson_path="resources/pokemon.ndjson",
+    output_dir="resources",
+    chunk_size=PARQUET_CHUNK_SIZE,
+):
+    """Writes moves, encounter locations and Pokédex entries as long tables
+    with dictionary-encoded string columns, one row per fact, so tools can
+    filter them with Arrow compute instead of walking nested dicts.
+    """
+    counts = {table: 0 for table in NORMALIZED_TABLES}
+    paths = {
+        table: Path(output_dir) / f"{table}.parquet" for table in NORMALIZED_TABLES
+    }
+    writers = {
+        table: pq.ParquetWriter(f"{paths[table]}.tmp", schema)
+        for table, schema in NORMALIZED_TABLES.items()
+    }
+    try:
+        for lines in _iter_line_chunks(ndjson_path, chunk_size):
+            batch = {table: [] for table in NORMALIZED_TABLES}
+            for line in lines:
+                for table, rows in _normalized_rows(json.loads(line)).items():
+                    batch[table].extend(rows)
+            for table, rows in batch.items():
+                writers[table].write_table(
+                    pa.Table.from_pylist(rows, schema=NORMALIZED_TABLES[table])
+                )
+                counts[table] += len(rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    for table, path in paths.items():
+        os.replace(f"{path}.tmp", path)
+        print(f"Saved {counts[table]} rows to {path}")
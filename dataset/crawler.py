@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+import httpx
+from httpx import AsyncClient
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+REQUEST_TIMEOUT = 10
+
+
+class FetchError(Exception):
+    """Raised when a resource cannot be fetched after all retries."""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for outgoing requests.
+
+    The limit grows by roughly one slot per round of fast responses and halves
+    on errors, at most once per cooldown so a burst of failures from the same
+    overload only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        latency_target: float = 1.0,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.reset(initial, max_limit)
+
+    def reset(self, initial: int, max_limit: int):
+        self.limit = float(min(initial, max_limit))
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _loop_condition(self) -> asyncio.Condition:
+        # A Condition binds to the first event loop that waits on it, so each
+        # loop (usually its own asyncio.run) gets a fresh one. Slots held on a
+        # previous loop died with it.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._condition
+
+    async def __aenter__(self):
+        condition = self._loop_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        condition = self._loop_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self, latency: float):
+        if latency <= self.latency_target:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_error(self):
+        now = time.monotonic()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(self.min_limit, self.limit / 2)
+            self._last_decrease = now
+
+
+class CrawlStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.latencies: List[float] = []
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self, limiter: Optional[AdaptiveLimiter] = None) -> str:
+        elapsed = time.monotonic() - self.started
+        requests = self.counts["requests"]
+        lines = [
+            f"Requests: {requests} in {elapsed:.1f}s "
+            f"({requests / elapsed if elapsed else 0:.1f} req/s)",
+            f"Cache hits: {self.counts['cache_hits']}, "
+            f"coalesced: {self.counts['coalesced']}, "
+            f"dump file reads: {self.counts['file_reads']}",
+            f"Retries: {self.counts['retries']} "
+            f"(429: {self.counts['status_429']}, 5xx: {self.counts['status_5xx']}, "
+            f"timeouts/transport: {self.counts['transport_errors']}), "
+            f"failed: {self.counts['failed']}",
+            f"Latency p50/p90/p99: {self.percentile(0.5) * 1000:.0f}/"
+            f"{self.percentile(0.9) * 1000:.0f}/{self.percentile(0.99) * 1000:.0f} ms",
+        ]
+        if limiter is not None:
+            lines.append(f"Concurrency limit at end: {limiter.limit:.1f}")
+        return "\n".join(lines)
+
+
+LIMITER = AdaptiveLimiter()
+CRAWL_STATS = CrawlStats()
+
+
+def reset_crawler(max_concurrency: int = 20, initial_concurrency: int = 4):
+    """Resets the limiter and stats at the start of a build run."""
+    LIMITER.reset(initial_concurrency, max_concurrency)
+    CRAWL_STATS.reset()
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _backoff_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        return min(retry_after, MAX_DELAY)
+    return min(MAX_DELAY, BASE_DELAY * 2**attempt) * random.uniform(0.5, 1.0)
+
+
+async def get_with_retries(
+    client: AsyncClient, url: str, headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    """GETs a URL under the adaptive limit, retrying 429s, 5xx and timeouts.
+
+    Any other response, including 304 and 404, is returned to the caller.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        async with LIMITER:
+            start = time.monotonic()
+            try:
+                response = await client.get(
+                    url, timeout=REQUEST_TIMEOUT, headers=headers
+                )
+            except httpx.TransportError:
+                CRAWL_STATS.counts["transport_errors"] += 1
+            latency = time.monotonic() - start
+
+        CRAWL_STATS.counts["requests"] += 1
+        CRAWL_STATS.latencies.append(latency)
+
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            LIMITER.on_success(latency)
+            return response
+
+        LIMITER.on_error()
+        if response is not None:
+            status = response.status_code
+            CRAWL_STATS.counts["status_429" if status == 429 else "status_5xx"] += 1
+
+        if attempt == MAX_RETRIES:
+            break
+        CRAWL_STATS.counts["retries"] += 1
+        await asyncio.sleep(_backoff_delay(attempt, response))
+
+    CRAWL_STATS.counts["failed"] += 1
+    reason = f"HTTP {response.status_code}" if response is not None else "timeout"
+    raise FetchError(f"{url}: {reason} after {MAX_RETRIES} retries")
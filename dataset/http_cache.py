@@ -0,0 +1,75 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+HTTP_CACHE_DIR = Path("resources/.http_cache")
+
+
+def content_hash(body: Any) -> str:
+    """SHA-256 of a JSON value, independent of key order and whitespace."""
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """On-disk cache of PokéAPI JSON responses, one gzip file per URL.
+
+    Entries keep the response's ETag and Last-Modified headers so a build can
+    revalidate them with conditional requests instead of refetching bodies.
+    With `revalidate` off, cached entries are served without any request.
+    """
+
+    def __init__(self, root: Path = HTTP_CACHE_DIR, revalidate: bool = False):
+        self.root = Path(root)
+        self.revalidate = revalidate
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json.gz"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, EOFError, OSError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(
+        self,
+        url: str,
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": content_hash(body),
+            "body": body,
+        }
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so a crash never leaves a torn entry.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw_file:
+            with gzip.GzipFile(fileobj=raw_file, mode="wb") as f:
+                f.write(json.dumps(entry).encode("utf-8"))
+        os.replace(tmp, path)
+        return entry
+
+    @staticmethod
+    def validators(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers for revalidating a cached entry."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
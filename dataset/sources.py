@@ -0,0 +1,120 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from httpx import AsyncClient
+
+from dataset.crawler import CRAWL_STATS, FetchError, get_with_retries
+from dataset.http_cache import HttpCache, content_hash
+
+DUMP_READ_WORKERS = 32
+
+
+class HttpSource:
+    """Fetches PokéAPI resources over HTTP through the on-disk cache."""
+
+    def __init__(self, cache: HttpCache):
+        self.cache = cache
+
+    async def fetch(self, client: AsyncClient, url: str) -> Tuple[Optional[dict], str]:
+        """Serves a URL from the on-disk HTTP cache when present, and only
+        revalidates it upstream when the cache's `revalidate` flag is set.
+        """
+        entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None and not self.cache.revalidate:
+            CRAWL_STATS.counts["cache_hits"] += 1
+            return entry["body"], entry["sha256"]
+
+        try:
+            response = await get_with_retries(client, url, self.cache.validators(entry))
+            if response.status_code == 304 and entry is not None:
+                return entry["body"], entry["sha256"]
+            if response.status_code == 404:
+                # Cache misses too, so a rebuild does not ask again for missing forms.
+                entry = await asyncio.to_thread(self.cache.put, url, None)
+                return None, entry["sha256"]
+            response.raise_for_status()
+            body = response.json()
+        except Exception as e:
+            # A stale copy beats failing the build when upstream is unavailable.
+            if entry is not None:
+                return entry["body"], entry["sha256"]
+            if isinstance(e, FetchError):
+                raise
+            raise FetchError(f"{url}: {e}") from e
+
+        entry = await asyncio.to_thread(
+            self.cache.put,
+            url,
+            body,
+            response.headers.get("etag"),
+            response.headers.get("last-modified"),
+        )
+        return body, entry["sha256"]
+
+
+class FileSystemSource:
+    """Reads resources from a local copy of the PokéAPI static JSON dump.
+
+    `root` is the directory holding `api/v2/...` (the `data/` directory of
+    PokeAPI/api-data), where each resource lives at
+    `api/v2/<resource>/<id>/index.json`. Any host and query string in a URL are
+    ignored, and names are resolved to ids through the resource's own
+    `index.json` listing. Files are read on a dedicated thread pool so many
+    profiles can be loaded in parallel; call `close` to shut it down.
+    """
+
+    def __init__(self, root, max_workers: int = DUMP_READ_WORKERS):
+        self.root = Path(root)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._name_ids: Dict[str, asyncio.Future] = {}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    async def _read_async(self, path: Path) -> Optional[dict]:
+        CRAWL_STATS.counts["file_reads"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._read, path)
+
+    async def _load_ids(self, resource: str) -> Dict[str, str]:
+        listing = await self._read_async(self.root / "api/v2" / resource / "index.json")
+        return {
+            entry["name"]: entry["url"].rstrip("/").rsplit("/", 1)[-1]
+            for entry in (listing or {}).get("results", [])
+        }
+
+    async def _resource_ids(self, resource: str) -> Dict[str, str]:
+        """Maps names to ids for one resource type, read once per source."""
+        future = self._name_ids.get(resource)
+        if future is None:
+            future = asyncio.ensure_future(self._load_ids(resource))
+            self._name_ids[resource] = future
+        return await future
+
+    async def fetch(self, client: AsyncClient, url: str) -> Tuple[Optional[dict], str]:
+        parts = urlsplit(url).path.strip("/").split("/")
+        if parts[:2] != ["api", "v2"] or len(parts) < 3:
+            raise FetchError(f"{url}: not a PokéAPI v2 resource")
+        resource, rest = parts[2], parts[3:]
+
+        if rest and not rest[0].isdigit():
+            resource_id = (await self._resource_ids(resource)).get(rest[0])
+            if resource_id is None:
+                return None, content_hash(None)
+            rest = [resource_id, *rest[1:]]
+
+        body = await self._read_async(
+            self.root.joinpath("api/v2", resource, *rest, "index.json")
+        )
+        return body, content_hash(body)
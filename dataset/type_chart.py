@@ -1,5 +1,6 @@
 import asyncio
 import json
+import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional
 from httpx import AsyncClient
@@ -61,6 +62,74 @@ async def build_type_chart() -> Dict[str, Dict[str, Dict[str, float]]]:
 
 TYPE_CHART_PATH = Path("resources/type_chart.json")
 
+LATEST_GENERATION = 9
+
+VERSION_GROUP_GENERATIONS: Dict[str, int] = {
+    "red-blue": 1,
+    "yellow": 1,
+    "red-green-japan": 1,
+    "blue-japan": 1,
+    "gold-silver": 2,
+    "crystal": 2,
+    "ruby-sapphire": 3,
+    "emerald": 3,
+    "firered-leafgreen": 3,
+    "colosseum": 3,
+    "xd": 3,
+    "diamond-pearl": 4,
+    "platinum": 4,
+    "heartgold-soulsilver": 4,
+    "black-white": 5,
+    "black-2-white-2": 5,
+    "x-y": 6,
+    "omega-ruby-alpha-sapphire": 6,
+    "sun-moon": 7,
+    "ultra-sun-ultra-moon": 7,
+    "lets-go-pikachu-lets-go-eevee": 7,
+    "sword-shield": 8,
+    "the-isle-of-armor": 8,
+    "the-crown-tundra": 8,
+    "brilliant-diamond-and-shining-pearl": 8,
+    "legends-arceus": 8,
+    "scarlet-violet": 9,
+    "the-teal-mask": 9,
+    "the-indigo-disk": 9,
+}
+
+# The chart only changed in Gen 2 and Gen 6, so generations map onto three eras,
+# each described as the types it lacks and its (attack, defend) differences from
+# the modern chart in resources/type_chart.json.
+_ERA_MISSING_TYPES: Dict[int, set] = {
+    1: {"steel", "dark", "fairy"},
+    2: {"fairy"},
+    6: set(),
+}
+
+_ERA_OVERRIDES: Dict[int, Dict[tuple, float]] = {
+    1: {
+        ("bug", "poison"): 2.0,
+        ("poison", "bug"): 2.0,
+        ("ghost", "psychic"): 0.0,
+        ("ice", "fire"): 1.0,
+    },
+    2: {
+        ("ghost", "steel"): 0.5,
+        ("dark", "steel"): 0.5,
+    },
+    6: {},
+}
+
+
+def generation_for(version_group: Optional[str]) -> int:
+    return VERSION_GROUP_GENERATIONS.get(version_group, LATEST_GENERATION)
+
+
+def _chart_era(generation: Optional[int]) -> int:
+    generation = generation or LATEST_GENERATION
+    if generation == 1:
+        return 1
+    return 2 if generation < 6 else 6
+
 
 @lru_cache(maxsize=1)
 def fetch_type_chart():
@@ -68,12 +137,36 @@ def fetch_type_chart():
         return json.load(f)
 
 
-def calculate_type_defenses(pokemon_types: list[str]) -> dict:
-    type_chart = fetch_type_chart()
-    attack_types = set(type_chart.keys())
-    combined_multipliers = {t: 1.0 for t in attack_types}
+@lru_cache(maxsize=None)
+def _era_type_chart(era: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    missing = _ERA_MISSING_TYPES[era]
+    chart = {
+        t: {
+            relation: {k: v for k, v in multipliers.items() if k not in missing}
+            for relation, multipliers in entry.items()
+        }
+        for t, entry in fetch_type_chart().items()
+        if t not in missing
+    }
+    for (attack_type, defend_type), multiplier in _ERA_OVERRIDES[era].items():
+        chart[attack_type]["offense"][defend_type] = multiplier
+        chart[defend_type]["defense"][attack_type] = multiplier
+    return chart
+
+
+def type_chart_for(generation: Optional[int] = None):
+    """The type chart as it stood in a generation, in the shape of `fetch_type_chart`."""
+    return _era_type_chart(_chart_era(generation))
+
+
+@lru_cache(maxsize=4096)
+def _type_defenses(pokemon_types: tuple, generation: Optional[int]) -> dict:
+    type_chart = type_chart_for(generation)
+    combined_multipliers = {t: 1.0 for t in type_chart}
 
     for p_type in pokemon_types:
+        if p_type not in type_chart:
+            continue
         type_defenses = type_chart[p_type]["defense"]
         for attack_type, multiplier in type_defenses.items():
             combined_multipliers[attack_type] *= multiplier
@@ -98,16 +191,26 @@ def calculate_type_defenses(pokemon_types: list[str]) -> dict:
         elif multiplier == 4.0:
             defenses["weak_to_4x"].append(attack_type)
 
-    return defenses
+    return {k: tuple(v) for k, v in defenses.items()}
+
 
+def calculate_type_defenses(
+    pokemon_types: list[str], generation: Optional[int] = None
+) -> dict:
+    defenses = _type_defenses(tuple(pokemon_types), generation)
+    return {k: list(v) for k, v in defenses.items()}
 
-def calculate_type_offenses(pokemon_types: list[str]) -> dict:
-    type_chart = fetch_type_chart()
+
+@lru_cache(maxsize=4096)
+def _type_offenses(pokemon_types: tuple, generation: Optional[int]) -> dict:
+    type_chart = type_chart_for(generation)
     super_effective = set()
     not_very_effective = set()
     no_effect = set()
 
     for p_type in pokemon_types:
+        if p_type not in type_chart:
+            continue
         offense_profile = type_chart[p_type]["offense"]
 
         for defending_type, multiplier in offense_profile.items():
@@ -119,7 +222,86 @@ def calculate_type_offenses(pokemon_types: list[str]) -> dict:
                 no_effect.add(defending_type)
 
     return {
-        "super_effective_against": sorted(list(super_effective)),
-        "not_very_effective_against": sorted(list(not_very_effective)),
-        "no_effect_against": sorted(list(no_effect)),
+        "super_effective_against": tuple(sorted(super_effective)),
+        "not_very_effective_against": tuple(sorted(not_very_effective)),
+        "no_effect_against": tuple(sorted(no_effect)),
+    }
+
+
+def calculate_type_offenses(
+    pokemon_types: list[str], generation: Optional[int] = None
+) -> dict:
+    offenses = _type_offenses(tuple(pokemon_types), generation)
+    return {k: list(v) for k, v in offenses.items()}
+
+
+@lru_cache(maxsize=1)
+def type_bits() -> Dict[str, int]:
+    """Assigns each type one bit, in type chart order, for compact type sets."""
+    return {t: 1 << i for i, t in enumerate(fetch_type_chart())}
+
+
+def types_to_mask(types: List[str]) -> int:
+    bits = type_bits()
+    mask = 0
+    for t in types:
+        mask |= bits.get(t, 0)
+    return mask
+
+
+def mask_to_types(mask: int) -> List[str]:
+    mask = int(mask or 0)
+    return [t for t, bit in type_bits().items() if mask & bit]
+
+
+@lru_cache(maxsize=None)
+def super_effective_masks(generation: Optional[int] = None) -> Dict[int, int]:
+    """Maps each attacking type bit to the mask of types it hits for 2x."""
+    type_chart = type_chart_for(generation)
+    return {
+        bit: types_to_mask(
+            [t for t, m in type_chart[attack_type]["offense"].items() if m == 2.0]
+        )
+        for attack_type, bit in type_bits().items()
+        if attack_type in type_chart
     }
+
+
+def coverage_from_mask(attack_mask: int, generation: Optional[int] = None) -> List[str]:
+    """Returns the types hit super-effectively by any attacking type in the mask."""
+    attack_mask = int(attack_mask or 0)
+    covered = 0
+    for bit, se_mask in super_effective_masks(generation).items():
+        if attack_mask & bit:
+            covered |= se_mask
+    return mask_to_types(covered)
+
+
+@lru_cache(maxsize=None)
+def type_matrix(generation: Optional[int] = None) -> np.ndarray:
+    """Multipliers for attacking types (rows) against defending types (columns).
+
+    Rows and columns follow `fetch_type_chart` order in every generation; types
+    that did not exist yet are neutral. An extra trailing column of ones stands
+    in for a missing secondary type.
+    """
+    type_chart = type_chart_for(generation)
+    names = list(fetch_type_chart())
+    matrix = np.array(
+        [
+            [type_chart.get(atk, {}).get("offense", {}).get(dfn, 1.0) for dfn in names]
+            for atk in names
+        ]
+    )
+    return np.hstack([matrix, np.ones((len(names), 1))])
+
+
+def type_index_arrays(types_column) -> tuple[np.ndarray, np.ndarray]:
+    """Returns primary and secondary type indices into `type_matrix` columns."""
+    index = {t: i for i, t in enumerate(fetch_type_chart())}
+    missing = len(index)
+    primary = np.array([index.get(t[0], missing) for t in types_column])
+    secondary = np.array(
+        [index.get(t[1], missing) if len(t) > 1 else missing for t in types_column]
+    )
+    return primary, secondary
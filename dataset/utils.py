@@ -1,28 +1,106 @@
+import asyncio
+import json
+import os
+import re
+import unicodedata
 import pandas as pd
-from typing import Optional, Any, List, Dict, Set
+from contextvars import ContextVar
+from typing import Optional, Any, Awaitable, Callable, List, Dict, Hashable, Set, Tuple
 from httpx import AsyncClient
-from async_lru import alru_cache
+from dataset.crawler import CRAWL_STATS
+from dataset.http_cache import HttpCache
+from dataset.sources import HttpSource
 from collections import defaultdict
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 BASE_URL = "https://pokeapi.co/api/v2"
 
 
-@alru_cache(maxsize=512)
+HTTP_CACHE = HttpCache()
+
+# Where fetch_url reads resources from; see set_data_source.
+DATA_SOURCE = HttpSource(HTTP_CACHE)
+
+
+class SingleFlight:
+    """Shares one in-flight computation per key among concurrent callers.
+
+    The computation runs as its own task and every caller, the first one
+    included, awaits it through asyncio.shield, so cancelling a caller never
+    cancels the work for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+
+# Requests in flight, keyed by URL, so concurrent callers share one fetch.
+_inflight = SingleFlight()
+
+# Set by a task to collect {url: content hash} for every resource it fetches.
+RESOURCE_HASHES: ContextVar[Optional[Dict[str, str]]] = ContextVar(
+    "resource_hashes", default=None
+)
+
+
+def set_data_source(source):
+    """Swaps the backend behind fetch_url, returning the previous one.
+
+    Use dataset.sources.FileSystemSource to build from a local PokéAPI dump.
+    """
+    global DATA_SOURCE
+    previous, DATA_SOURCE = DATA_SOURCE, source
+    return previous
+
+
 async def fetch_url(client: AsyncClient, url: str) -> Optional[dict]:
-    """Safely fetches a single URL, returning JSON or None on error."""
-    try:
-        response = await client.get(url, timeout=10)
-        if response.status_code == 404:
-            return None
-        response.raise_for_status()
-        return response.json()
-    except Exception:
-        return None
+    """Fetches a single URL as JSON, returning None if it does not exist.
+
+    Raises FetchError when the resource still cannot be read after retries and
+    nothing is cached.
+    """
+    body, _ = await fetch_resource(client, url)
+    return body
+
+
+async def fetch_resource(client: AsyncClient, url: str) -> Tuple[Optional[dict], str]:
+    """Fetches a URL, returning its JSON body and content hash.
+
+    Concurrent calls for the same URL await a single shared request. The hash
+    is also recorded in RESOURCE_HASHES when the calling task has set it.
+    """
+    if url in _inflight:
+        CRAWL_STATS.counts["coalesced"] += 1
+    result = await _inflight.run(url, lambda: DATA_SOURCE.fetch(client, url))
+
+    hashes = RESOURCE_HASHES.get()
+    if hashes is not None:
+        hashes[url] = result[1]
+    return result
 
 
 _PARQUET_PATH = "resources/pokemon.parquet"
+_MOVES_PATH = "resources/moves.parquet"
+_POKEMON_MOVES_PATH = "resources/pokemon_moves.parquet"
+_POKEMON_LOCATIONS_PATH = "resources/pokemon_locations.parquet"
+_POKEMON_LORE_PATH = "resources/pokemon_lore.parquet"
 _cached_df = None
+_cached_moves_df = None
+_cached_aliases: Optional[Dict[str, str]] = None
+_cached_tables: Dict[str, pa.Table] = {}
 
 
 def normalize(data):
@@ -37,6 +115,12 @@ def normalize(data):
     return data
 
 
+def get_dataset_version() -> str:
+    """Identifies the parquet build currently on disk, for keying derived caches."""
+    stat = os.stat(_PARQUET_PATH)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
 def load_pokemon_dataset() -> pd.DataFrame:
     global _cached_df
     if _cached_df is None:
@@ -46,6 +130,95 @@ def load_pokemon_dataset() -> pd.DataFrame:
     return _cached_df
 
 
+def pokemon_alias_key(name: str) -> str:
+    """Folds case, accents, spacing and punctuation, so 'Mr. Mime' matches 'mr-mime'."""
+    name = name.lower().replace("♀", "-f").replace("♂", "-m")
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", name)
+
+
+# PokéAPI numbers alternate forms from 10001; default forms use their dex number.
+FIRST_FORM_ID = 10001
+
+
+def _species_key(row: pd.Series) -> str:
+    # Fields PokéAPI keeps on the species, so every form of one shares them.
+    return json.dumps(
+        [row["genus"], row["evolves_from"], row["pokedex_entries"]],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def load_pokemon_aliases() -> Dict[str, str]:
+    """Maps alias keys to dataset names.
+
+    A species whose forms are all suffixed is also reachable by its species
+    name (e.g. 'giratina' for 'giratina-altered'), resolving to its default
+    form. Names sharing a prefix across species ('tapu-koko', 'iron-valiant')
+    or belonging to a single Pokémon ('type-null') get no prefix alias.
+    """
+    global _cached_aliases
+    if _cached_aliases is None:
+        df = load_pokemon_dataset()
+        aliases = {pokemon_alias_key(name): name for name in df.index}
+        forms = defaultdict(list)
+        for name in df.index:
+            prefix = name.split("-")[0]
+            if len(prefix) >= 3 and prefix != name:
+                forms[prefix].append(name)
+        for prefix, names in forms.items():
+            rows = df.loc[names]
+            defaults = rows.index[rows["id"] < FIRST_FORM_ID]
+            if (
+                len(names) > 1
+                and len(defaults) == 1
+                and rows.apply(_species_key, axis=1).nunique() == 1
+            ):
+                aliases.setdefault(pokemon_alias_key(prefix), defaults[0])
+        _cached_aliases = aliases
+    return _cached_aliases
+
+
+def resolve_pokemon_name(name: str) -> Optional[str]:
+    return load_pokemon_aliases().get(pokemon_alias_key(name))
+
+
+def load_move_table() -> pd.DataFrame:
+    global _cached_moves_df
+    if _cached_moves_df is None:
+        _cached_moves_df = pd.read_parquet(_MOVES_PATH)
+    return _cached_moves_df
+
+
+def _load_table(path: str) -> pa.Table:
+    if path not in _cached_tables:
+        # Row groups carry their own dictionaries; share one per column so
+        # compute kernels such as group_by can work across chunks.
+        _cached_tables[path] = pq.read_table(path).unify_dictionaries()
+    return _cached_tables[path]
+
+
+def load_pokemon_moves() -> pa.Table:
+    """Long table of (pokemon, version_group, method, level, move) learnset rows."""
+    return _load_table(_POKEMON_MOVES_PATH)
+
+
+def load_pokemon_locations() -> pa.Table:
+    """Long table of (pokemon, version, location) encounter rows."""
+    return _load_table(_POKEMON_LOCATIONS_PATH)
+
+
+def load_pokemon_lore() -> pa.Table:
+    """Long table of (pokemon, version, text) Pokédex entry rows."""
+    return _load_table(_POKEMON_LORE_PATH)
+
+
+def move_slug(name: str) -> str:
+    """Canonical move key, as in moves.parquet: 'Thunder Punch' -> 'thunder-punch'."""
+    return name.lower().strip().replace(" ", "-")
+
+
 def clean_flavor_text(text: str) -> str:
     return text.replace("\n", " ").replace("\x0c", " ").strip()
 
@@ -194,6 +367,7 @@ def process_evolution_chain(chain_link: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     return paths
 
+
 STRATEGIC_MOVE_TAGS: Dict[str, Set[str]] = {
     "pivot": {"u-turn", "volt switch", "flip turn", "parting shot"},
     "hazard_setter": {"stealth rock", "spikes", "toxic spikes", "sticky web"},
@@ -296,6 +470,22 @@ def process_moves(moves_data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]
     return final_result
 
 
+def process_move_type_masks(
+    moves_data: List[Dict[str, Any]], move_type_bits: Dict[str, int]
+) -> Dict[str, int]:
+    """ORs the attack type bits of every damaging move learnable per version group."""
+    masks = defaultdict(int)
+
+    for move_entry in moves_data:
+        bit = move_type_bits.get(move_entry["move"]["name"], 0)
+        if not bit:
+            continue
+        for vgd in move_entry["version_group_details"]:
+            masks[format_string(vgd["version_group"]["name"])] |= bit
+
+    return dict(masks)
+
+
 def process_encounters(encounter_data: List[Dict[str, Any]]) -> Dict[str, List[str]]:
     game_to_locations = defaultdict(set)
 
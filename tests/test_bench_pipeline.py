@@ -0,0 +1,25 @@
+import argparse
+import asyncio
+import contextlib
+from unittest import mock
+
+import chainlit as cl
+
+from agents.metrics import METRICS
+from benchmarks.bench_pipeline import NoOpStep, NoOpText, run_sessions, stub_models
+
+
+def test_stub_sessions_run_offline():
+    args = argparse.Namespace(
+        sessions=3, concurrency=2, rounds=0, queries=1, pipeline_fraction=1.0
+    )
+    with contextlib.ExitStack() as stack:
+        for agent, model in stub_models(latency=0.0):
+            stack.enter_context(agent.override(model=model))
+        stack.enter_context(mock.patch.object(cl, "Step", NoOpStep))
+        stack.enter_context(mock.patch.object(cl, "Text", NoOpText))
+        before = METRICS.snapshot().get("node", {}).get("Report", {}).get("calls", 0)
+        latencies = asyncio.run(run_sessions(args))
+
+    assert len(latencies) == 3
+    assert METRICS.snapshot()["node"]["Report"]["calls"] == before + 3
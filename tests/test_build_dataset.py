@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+import dataset.utils
+from benchmarks.mock_pokeapi import write_synthetic_dump
+from dataset.build_dataset import (
+    _truncate_partial_line,
+    build_normalized_tables,
+    build_parquet_dataset,
+    checkpoint_names,
+    fetch_pokemon_profiles,
+)
+from dataset.utils import move_slug
+from tools.search_pokemon_by_criteria import _pokemon_learning_all
+
+
+def test_checkpoint_names_skip_torn_lines(tmp_path):
+    path = tmp_path / "pokemon.ndjson"
+    path.write_bytes(
+        b'{"id": 1, "name": "bulbasaur", "types": ["grass"]}\n'
+        b'{"types": ["psychic"], "name": "mew"}\n'
+        b'{"id": 3, "name": "venusaur", "ty'
+    )
+    assert checkpoint_names(path) == {"bulbasaur", "mew"}
+    assert checkpoint_names(tmp_path / "missing.ndjson") == set()
+
+
+def test_truncate_partial_line(tmp_path):
+    path = tmp_path / "pokemon.ndjson"
+    path.write_bytes(b'{"name": "a"}\n{"name": "b"}\n{"name": "c", "ty')
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b'{"name": "a"}\n{"name": "b"}\n'
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b'{"name": "a"}\n{"name": "b"}\n'
+
+    path.write_bytes(b'{"name": "a", "ty')
+    _truncate_partial_line(path)
+    assert path.read_bytes() == b""
+    _truncate_partial_line(tmp_path / "missing.ndjson")
+
+
+@pytest.fixture
+def build(tmp_path):
+    """Builds the checkpoint from a synthetic dump of six Pokémon."""
+    dump = write_synthetic_dump(tmp_path / "dump", count=6, moves=12)
+    paths = {
+        "checkpoint_path": tmp_path / "pokemon.ndjson",
+        "failures_path": tmp_path / "failures.ndjson",
+        "moves_path": tmp_path / "moves.parquet",
+        "manifest_path": tmp_path / "manifest.json",
+    }
+
+    def run(**kwargs):
+        asyncio.run(fetch_pokemon_profiles(dump_dir=dump, **paths, **kwargs))
+        with paths["checkpoint_path"].open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    run.dump = dump
+    run.paths = paths
+    return run
+
+
+def test_build_resumes_from_a_torn_checkpoint(build, capsys):
+    profiles = build()
+    assert [p["name"] for p in profiles] == [f"synthmon-{i}" for i in range(1, 7)]
+
+    # Simulate a crash three profiles in, mid-way through writing the fourth.
+    lines = build.paths["checkpoint_path"].read_text(encoding="utf-8").splitlines()
+    build.paths["checkpoint_path"].write_text(
+        "\n".join(lines[:3]) + "\n" + lines[3][:40], encoding="utf-8"
+    )
+    capsys.readouterr()
+
+    assert build() == profiles
+    assert "Fetching 3 Pokémon profiles (3 already checkpointed)" in (
+        capsys.readouterr().out
+    )
+
+
+def test_refresh_rebuilds_only_profiles_from_changed_resources(build, capsys):
+    profiles = build()
+    capsys.readouterr()
+
+    assert build(refresh=True) == profiles
+    assert "Fetching 0 Pokémon profiles" in capsys.readouterr().out
+
+    # Synthmon 1 and 2 share the first evolution chain.
+    chain_path = build.dump / "api/v2/evolution-chain/1/index.json"
+    chain = json.loads(chain_path.read_text(encoding="utf-8"))
+    chain["chain"]["evolves_to"][0]["evolution_details"][0]["min_level"] = 20
+    chain_path.write_text(json.dumps(chain), encoding="utf-8")
+
+    refreshed = build(refresh=True)
+    out = capsys.readouterr().out
+    assert "1 resources changed upstream" in out
+    assert "Fetching 2 Pokémon profiles (4 already checkpointed)" in out
+    assert [p["name"] for p in refreshed] == [p["name"] for p in profiles]
+    assert refreshed[0] != profiles[0] and refreshed[1] != profiles[1]
+    assert refreshed[2:] == profiles[2:]
+
+    manifest = json.loads(build.paths["manifest_path"].read_text(encoding="utf-8"))
+    assert sorted(manifest["profiles"]) == [f"synthmon-{i}" for i in range(1, 7)]
+
+
+def learned_moves(profile, version_group=None):
+    moves = set()
+    for group, moveset in profile["moves"].items():
+        if version_group in (None, group):
+            for method, names in moveset.items():
+                if method == "level_up":
+                    names = [move["name"] for move in names]
+                if method != "strategic_tags":
+                    moves.update(move_slug(name) for name in names)
+    return moves
+
+
+def test_learns_moves_filter_scans_the_normalized_table(build, tmp_path, monkeypatch):
+    profiles = build()
+    # Small chunks give each table several row groups to unify.
+    build_normalized_tables(
+        build.paths["checkpoint_path"], output_dir=tmp_path, chunk_size=2
+    )
+    monkeypatch.setattr(
+        dataset.utils, "_POKEMON_MOVES_PATH", str(tmp_path / "pokemon_moves.parquet")
+    )
+    monkeypatch.setattr(dataset.utils, "_cached_tables", {})
+
+    for moves, version_group in [
+        (["Move 1", "move-2"], None),
+        (["Move 3"], "emerald"),
+        (["move-4", "Move 5", "Move 6"], "sun-moon"),
+        (["Move 1", "Thunder Punch"], None),
+    ]:
+        expected = {
+            p["name"]
+            for p in profiles
+            if set(map(move_slug, moves)) <= learned_moves(p, version_group)
+        }
+        assert _pokemon_learning_all(moves, version_group) == expected
+    assert _pokemon_learning_all(["Move 1"], "emerald")
+    assert not _pokemon_learning_all(["Thunder Punch"])
+
+
+def test_parquet_is_written_in_chunks_in_checkpoint_order(build, tmp_path):
+    profiles = build()
+    output = tmp_path / "pokemon.parquet"
+    build_parquet_dataset(
+        build.paths["checkpoint_path"], output, chunk_size=4, max_workers=2
+    )
+
+    df = pd.read_parquet(output)
+    assert list(df.index) == [p["name"] for p in profiles]
+    assert df.loc["synthmon-2", "evolves_from"] == "synthmon-1"
+    assert df["full_profile"].str.contains("synthmon").all()
+    # Versions missing from the first chunk still get a struct field.
+    versions = {v for p in profiles for v in p["moves"]}
+    assert set(df["move_type_masks"].iloc[0]) == versions
+
+
+def test_parquet_rebuild_reformats_only_changed_profiles(build, tmp_path, capsys):
+    build()
+    checkpoint, output = build.paths["checkpoint_path"], tmp_path / "pokemon.parquet"
+    build_parquet_dataset(checkpoint, output, chunk_size=4, max_workers=2)
+    first = pd.read_parquet(output)
+    capsys.readouterr()
+
+    build_parquet_dataset(checkpoint, output, chunk_size=4, max_workers=2)
+    out = capsys.readouterr().out
+    assert "(0 rebuilt, 6 unchanged)" in out
+    pd.testing.assert_frame_equal(pd.read_parquet(output), first)
+
+    lines = checkpoint.read_text(encoding="utf-8").splitlines()
+    profile = json.loads(lines[4])
+    profile["genus"] = "Changed Pokémon"
+    lines[4] = json.dumps(profile)
+    checkpoint.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    build_parquet_dataset(checkpoint, output, chunk_size=4, max_workers=2)
+    out = capsys.readouterr().out
+    assert "(1 rebuilt, 5 unchanged)" in out
+    assert "format_pokemon_profile" in out
+    rebuilt = pd.read_parquet(output)
+    assert list(rebuilt.index) == list(first.index)
+    assert rebuilt.loc["synthmon-5", "genus"] == "Changed Pokémon"
+    full_profile = json.loads(rebuilt.loc["synthmon-5", "full_profile"])
+    assert full_profile["profile"]["identity"]["genus"] == "Changed Pokémon"
+    pd.testing.assert_frame_equal(rebuilt.drop("synthmon-5"), first.drop("synthmon-5"))
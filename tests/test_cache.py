@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+
+import dataset.utils
+import tools.analyse_pokemon_team
+import tools.cache
+from resources.enums import VersionGroup
+from tools.cache import DiskBackend, MemoryBackend, ToolCache
+from tools.utils import AsyncLRUCache
+
+
+@pytest.fixture(autouse=True)
+def dataset_version(monkeypatch):
+    monkeypatch.setattr(tools.cache, "get_dataset_version", lambda: "test")
+
+
+def test_tool_cache_survives_owner_cancellation():
+    calls = 0
+
+    async def slow_tool(name: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return name.upper()
+
+    async def scenario():
+        cache = ToolCache(MemoryBackend())
+        tool = cache.wrap(slow_tool)
+        owner = asyncio.ensure_future(tool("gengar"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(tool("gengar"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        assert await waiter == "GENGAR"
+        assert owner.cancelled()
+        assert await tool("gengar") == "GENGAR"
+        return cache.stats()["slow_tool"]
+
+    stats = asyncio.run(scenario())
+    assert calls == 1
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 1, 1)
+
+
+def test_tool_cache_shares_errors_without_caching_them():
+    calls = 0
+
+    async def failing_tool(name: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError(name)
+
+    async def scenario():
+        tool = ToolCache(MemoryBackend()).wrap(failing_tool)
+        results = await asyncio.gather(tool("mew"), tool("mew"), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await tool("mew")
+
+    asyncio.run(scenario())
+    assert calls == 2
+
+
+def test_async_lru_cache_survives_owner_cancellation():
+    async def compute():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def scenario():
+        cache = AsyncLRUCache(maxsize=4)
+        owner = asyncio.ensure_future(cache.get_or_compute("team", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute("team", compute))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        assert await waiter == 42
+        assert await cache.get_or_compute("team", compute) == 42
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 1, 1)
+
+
+def test_fetch_resource_survives_owner_cancellation():
+    class SlowSource:
+        fetches = 0
+
+        async def fetch(self, client, url):
+            SlowSource.fetches += 1
+            await asyncio.sleep(0.05)
+            return {"url": url}, "hash"
+
+    async def scenario():
+        owner = asyncio.ensure_future(dataset.utils.fetch_resource(None, "/pokemon/1"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(dataset.utils.fetch_resource(None, "/pokemon/1"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await waiter
+
+    previous = dataset.utils.set_data_source(SlowSource())
+    try:
+        assert asyncio.run(scenario()) == ({"url": "/pokemon/1"}, "hash")
+    finally:
+        dataset.utils.set_data_source(previous)
+    assert SlowSource.fetches == 1
+
+
+def test_team_analyses_are_keyed_by_multiset_version_and_dataset(monkeypatch):
+    module = tools.analyse_pokemon_team
+    calls = []
+    version = "v1"
+
+    def analyse(members, game_version):
+        calls.append((members, game_version))
+        return f"{members} {game_version}"
+
+    monkeypatch.setattr(module, "_analyse_team", analyse)
+    monkeypatch.setattr(module, "get_dataset_version", lambda: version)
+    monkeypatch.setattr(module, "_analysis_cache", AsyncLRUCache(maxsize=2))
+
+    async def scenario():
+        first = await module.analyse_pokemon_team(["Gengar", "pikachu", "gengar"])
+        same = await module.analyse_pokemon_team([" pikachu", "GENGAR", "Gengar"])
+        assert first == same
+        await module.analyse_pokemon_team(["gengar", "pikachu"])
+        await module.analyse_pokemon_team(["gengar", "pikachu", "gengar"], "red-blue")
+
+    asyncio.run(scenario())
+    version = "v2"
+    asyncio.run(module.analyse_pokemon_team(["pikachu", "gengar", "gengar"]))
+
+    assert calls == [
+        (["gengar", "gengar", "pikachu"], None),
+        (["gengar", "pikachu"], None),
+        (["gengar", "gengar", "pikachu"], "red-blue"),
+        (["gengar", "gengar", "pikachu"], None),
+    ]
+    assert module.analysis_cache_stats()["hits"] == 1
+    assert module.analysis_cache_stats()["evictions"] == 2
+
+
+def test_tool_cache_keys_use_canonical_arguments(monkeypatch):
+    calls = []
+
+    async def lookup(names: list, game_version=None, limit: int = 10) -> str:
+        calls.append(names)
+        return ",".join(names)
+
+    async def scenario():
+        tool = ToolCache(MemoryBackend()).wrap(lookup)
+        await tool(["gengar "], VersionGroup("red-blue"))
+        await tool([" gengar"], game_version="red-blue", limit=10)
+        await tool(["gengar"], "red-blue", limit=5)
+        monkeypatch.setattr(tools.cache, "get_dataset_version", lambda: "rebuilt")
+        await tool(["gengar"], "red-blue")
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+
+
+def test_disk_backend_persists_across_instances_until_expiry(tmp_path):
+    async def scenario():
+        await DiskBackend(tmp_path).set("ab12", {"answer": 42})
+        await DiskBackend(tmp_path).set("cd34", "stale", ttl=-1)
+        return (
+            await DiskBackend(tmp_path).get("ab12"),
+            await DiskBackend(tmp_path).get("cd34"),
+            await DiskBackend(tmp_path).get("ef56"),
+        )
+
+    assert asyncio.run(scenario()) == (
+        (True, {"answer": 42}),
+        (False, None),
+        (False, None),
+    )
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+import dataset.crawler
+from benchmarks.mock_pokeapi import MockPokeApi, write_synthetic_dump
+from dataset.crawler import (
+    CRAWL_STATS,
+    MAX_DELAY,
+    AdaptiveLimiter,
+    FetchError,
+    _backoff_delay,
+    get_with_retries,
+    reset_crawler,
+)
+
+
+def test_limiter_works_across_event_loops():
+    limiter = AdaptiveLimiter(initial=1)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def burst():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    # The second run contends on a new loop without a reset in between.
+    asyncio.run(burst())
+    asyncio.run(burst())
+    assert peak == 1
+    assert limiter.in_flight == 0
+
+
+def test_limiter_halves_once_per_cooldown():
+    limiter = AdaptiveLimiter(initial=8, cooldown=60)
+    limiter.on_error()
+    limiter.on_error()
+    assert limiter.limit == 4
+    limiter.on_success(latency=0.1)
+    assert limiter.limit == 4.25
+
+
+@pytest.mark.parametrize(
+    "header, delay",
+    [("2", 2.0), ("-1", 0.0), ("3600", MAX_DELAY), ("soon", None)],
+)
+def test_backoff_honours_retry_after(header, delay):
+    response = httpx.Response(429, headers={"Retry-After": header})
+    if delay is None:
+        # Unparseable headers fall back to jittered exponential backoff.
+        assert 1.0 <= _backoff_delay(2, response) <= 2.0
+    else:
+        assert _backoff_delay(0, response) == delay
+
+
+def test_backoff_accepts_http_dates():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    response = httpx.Response(503, headers={"Retry-After": format_datetime(retry_at)})
+    assert 8 <= _backoff_delay(0, response) <= 10
+
+
+@pytest.fixture
+def dump(tmp_path):
+    write_synthetic_dump(tmp_path, count=2, moves=12)
+    return tmp_path
+
+
+def crawl(api: MockPokeApi, *requests):
+    """Serves `api` for one run and GETs each (path, headers) in turn."""
+
+    async def scenario():
+        async with api, httpx.AsyncClient() as client:
+            return [
+                await get_with_retries(client, f"{api.base}{path}", headers)
+                for path, headers in requests
+            ]
+
+    reset_crawler()
+    return asyncio.run(scenario())
+
+
+def test_retries_rate_limits_until_success(dump):
+    api = MockPokeApi(dump, rate_limit_rate=0.6, retry_after=0.01, seed=3)
+    [response] = crawl(api, ("/api/v2/pokemon/1/", None))
+    assert response.status_code == 200
+    assert response.json()["name"] == "synthmon-1"
+    assert CRAWL_STATS.counts["retries"] == CRAWL_STATS.counts["status_429"] > 0
+    assert CRAWL_STATS.counts["failed"] == 0
+
+
+def test_gives_up_after_max_retries(dump, monkeypatch):
+    monkeypatch.setattr(dataset.crawler, "MAX_RETRIES", 2)
+    monkeypatch.setattr(dataset.crawler, "BASE_DELAY", 0.001)
+    api = MockPokeApi(dump, error_rate=1.0)
+    with pytest.raises(FetchError, match="HTTP 500 after 2 retries"):
+        crawl(api, ("/api/v2/pokemon/1/", None))
+    assert CRAWL_STATS.counts["status_5xx"] == 3
+    assert CRAWL_STATS.counts["failed"] == 1
+
+
+def test_returns_not_found_and_not_modified_without_retrying(dump):
+    [found] = crawl(MockPokeApi(dump), ("/api/v2/pokemon/1/", None))
+    etag = found.headers["etag"]
+    missing, unchanged = crawl(
+        MockPokeApi(dump),
+        ("/api/v2/pokemon/99/", None),
+        ("/api/v2/pokemon/1/", {"If-None-Match": etag}),
+    )
+    assert (missing.status_code, unchanged.status_code) == (404, 304)
+    assert CRAWL_STATS.counts["retries"] == 0
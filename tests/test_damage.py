@@ -0,0 +1,19 @@
+from tools.calculate_damage import STAB_MULTIPLIER, damage_range, scale_hp, scale_stat
+
+
+def test_damage_range_matches_reference_roll():
+    # Bulbapedia's worked example: Lv. 75 Glaceon (Attack 123) using Ice Fang
+    # on Garchomp (Defense 163) does 168-196. Folding STAB and the 4x
+    # multiplier into a single step would give 168-198.
+    low, high = damage_range(75, 65, 123, 163, STAB_MULTIPLIER, (2.0, 2.0))
+    assert (low, high) == (168, 196)
+
+
+def test_damage_range_applies_resistances_and_immunities():
+    assert damage_range(50, 90, 100, 100, 1.0, (0.5, 0.5)) == (8, 10)
+    assert damage_range(50, 90, 100, 100, STAB_MULTIPLIER, (2.0, 0.0)) == (0, 0)
+
+
+def test_scaled_stats_use_perfect_ivs():
+    assert scale_stat(100, 50) == 120
+    assert scale_hp(100, 50) == 175
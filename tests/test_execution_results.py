@@ -0,0 +1,56 @@
+import pytest
+
+from agents.models import ExecutionResult
+from agents.utils import KEEP_RECENT_RESULTS, count_tokens, format_execution_results
+
+FILLER = "Gengar outspeeds Alakazam and hits it with Shadow Ball. " * 60
+
+
+def results(count: int) -> list[ExecutionResult]:
+    return [
+        ExecutionResult(
+            query=f"Question {i} about Gengar",
+            tool_name="get_pokemon_profiles",
+            tool_output="{}",
+            is_success=True,
+            summary=f"Finding {i} is that Gengar wins. {FILLER}",
+        )
+        for i in range(count)
+    ]
+
+
+def test_small_results_are_unchanged():
+    formatted = format_execution_results(results(2), token_budget=100_000)
+    assert formatted.count(FILLER.strip()) == 2
+    assert "earlier_results" not in formatted
+
+
+def test_no_budget_keeps_everything():
+    formatted = format_execution_results(results(5), token_budget=None)
+    assert formatted.count(FILLER.strip()) == 5
+
+
+def test_older_results_roll_up_with_their_findings():
+    formatted = format_execution_results(results(15), token_budget=2800)
+    assert count_tokens(formatted) <= 2800
+    assert "<tool_name>earlier_results</tool_name>" in formatted
+    # Newest merged findings are kept first, in their original order.
+    assert (
+        "Finding 10 is that Gengar wins. Finding 11 is that Gengar wins." in formatted
+    )
+    assert formatted.count(FILLER.strip()) == KEEP_RECENT_RESULTS
+
+
+@pytest.mark.parametrize("budget", [1500, 600, 200])
+def test_recent_results_are_compacted_when_they_overflow(budget):
+    formatted = format_execution_results(results(15), token_budget=budget)
+    assert count_tokens(formatted) <= budget
+    assert formatted.count(FILLER.strip()) < KEEP_RECENT_RESULTS
+    assert "Question 14 about Gengar" in formatted
+    assert "Finding 14 is that Gengar wins." in formatted
+
+
+def test_tiny_budgets_roll_everything_up():
+    formatted = format_execution_results(results(15), token_budget=200)
+    assert formatted.count("<execution_result>") < 15
+    assert "<tool_name>earlier_results</tool_name>" in formatted
@@ -0,0 +1,58 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+import tools.find_counters
+from dataset.type_chart import types_to_mask
+from tools.find_counters import find_counters
+
+
+def pokemon(types, speed, attack_types, games=("red-blue", "x-y"), legendary=False):
+    mask = types_to_mask(attack_types)
+    return {
+        "types": types,
+        "base_speed": speed,
+        "is_legendary": legendary,
+        "is_mythical": False,
+        "moves": {game: {"level_up": []} for game in games},
+        "move_type_mask": mask,
+        "move_type_masks": {game: mask for game in games},
+    }
+
+
+@pytest.fixture(autouse=True)
+def dataset(monkeypatch):
+    rows = {
+        "charizard": pokemon(["fire", "flying"], 100, ["fire", "flying"]),
+        "golem": pokemon(["rock", "ground"], 45, ["rock", "ground"]),
+        "starmie": pokemon(["water", "psychic"], 115, ["water", "psychic", "ice"]),
+        "venusaur": pokemon(["grass", "poison"], 80, ["grass"], games=["x-y"]),
+        "mewtwo": pokemon(["psychic"], 130, ["psychic"], legendary=True),
+    }
+    df = pd.DataFrame.from_dict(rows, orient="index")
+    monkeypatch.setattr(tools.find_counters, "load_pokemon_dataset", lambda: df)
+
+
+def ranking(table: str):
+    rows = [line.split()[0] for line in table.splitlines()]
+    return rows[rows.index("name") + 1 :]
+
+
+def test_counters_rank_by_matchup_and_speed():
+    table = asyncio.run(find_counters(["Charizard", "missingno"]))
+    assert table.startswith("Counters for charizard\nNot found: missingno")
+    assert ranking(table) == ["golem", "starmie", "mewtwo", "venusaur"]
+
+
+def test_counters_filter_by_game_and_legendary_status():
+    table = asyncio.run(
+        find_counters(["charizard"], game_version="red-blue", exclude_legendary=True)
+    )
+    assert ranking(table) == ["golem", "starmie"]
+
+
+def test_counters_need_a_known_opponent():
+    assert asyncio.run(find_counters(["missingno"])) == (
+        "None of the opponents were found: missingno"
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import os
+from collections import defaultdict
+
+# OpenAIModel wants a key when constructed; the tests override every model.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import chainlit as cl
+import pytest
+from pydantic_ai.messages import UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_graph import GraphRunContext
+
+import agents.agents as agents
+from agents.graph import Execute, Report
+from agents.models import ExecutionPlan, ExecutionResult, State
+from benchmarks.bench_pipeline import NoOpStep, _output
+
+
+class RecordingStep(NoOpStep):
+    tokens = defaultdict(list)
+
+    def __init__(self, name: str, *args, **kwargs):
+        super().__init__()
+        self.name = name
+
+    async def stream_token(self, token: str, *args, **kwargs):
+        RecordingStep.tokens[self.name].append(token)
+
+
+@pytest.fixture(autouse=True)
+def steps(monkeypatch):
+    RecordingStep.tokens = defaultdict(list)
+    monkeypatch.setattr(cl, "Step", RecordingStep)
+    return RecordingStep.tokens
+
+
+def prompt(messages) -> str:
+    return next(
+        part.content for part in messages[0].parts if isinstance(part, UserPromptPart)
+    )
+
+
+def test_execute_records_results_in_completion_order(steps):
+    delays = {"slow query": 0.05, "fast query": 0.0, "failing query": 0.02}
+
+    async def execute(messages, info: AgentInfo):
+        query = prompt(messages)
+        await asyncio.sleep(delays[query])
+        if query == "failing query":
+            raise RuntimeError("tool exploded")
+        return _output(info, is_success=True, summary=f"Summary of {query}.")
+
+    async def scenario():
+        state = State()
+        plan = ExecutionPlan(thoughts="", queries=list(delays), is_complete=False)
+        with agents.execute_agent.override(model=FunctionModel(execute)):
+            await Execute(plan=plan).run(GraphRunContext(state=state, deps=None))
+        return state
+
+    state = asyncio.run(scenario())
+    assert [r.query for r in state.execution_results] == [
+        "fast query",
+        "failing query",
+        "slow query",
+    ]
+    assert [r.is_success for r in state.execution_results] == [True, False, True]
+    assert state.execution_results[2].summary == "Summary of slow query."
+    streamed = "".join(steps["🔧 Executing"])
+    assert (
+        streamed.index("fast query")
+        < streamed.index("❌ _failing query_")
+        < streamed.index("Summary of slow query.")
+    )
+
+
+def test_report_streams_deltas_before_sources(steps, monkeypatch):
+    monkeypatch.setattr(cl, "Text", lambda **kwargs: type("Text", (), kwargs))
+    words = ["Gengar ", "outspeeds ", "Alakazam."]
+
+    async def report(messages, info: AgentInfo):
+        for word in words:
+            # Slower than stream_text's debounce, so each word is its own delta.
+            await asyncio.sleep(0.15)
+            yield word
+
+    async def scenario():
+        state = State()
+        for i, is_success in enumerate([True, False]):
+            state.execution_results.append(
+                ExecutionResult(
+                    query=f"Query {i}",
+                    tool_name="find_counters",
+                    tool_output="",
+                    is_success=is_success,
+                    summary=f"Summary {i}",
+                )
+            )
+        model = FunctionModel(stream_function=report)
+        with agents.report_agent.override(model=model):
+            await Report().run(GraphRunContext(state=state, deps=None))
+        return state
+
+    state = asyncio.run(scenario())
+    assert state.report == "Gengar outspeeds Alakazam."
+    assert steps["✅ Final Report"] == words + ["\n\nSources: find_counters [0]"]
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from dataset.build_dataset import damaging_move_type_bits
+from dataset.type_chart import coverage_from_mask, mask_to_types, types_to_mask
+from dataset.utils import process_move_type_masks
+from tools.analyse_pokemon_team import _learnset_attack_mask
+
+
+def learnset(*entries):
+    return [
+        {
+            "move": {"name": move},
+            "version_group_details": [
+                {"version_group": {"name": group}} for group in groups
+            ],
+        }
+        for move, groups in entries
+    ]
+
+
+def test_masks_cover_damaging_moves_per_version_group():
+    moves = pd.DataFrame(
+        {
+            "type": ["fire", "electric", "normal", "shadow"],
+            "damage_class": ["special", "physical", "status", "physical"],
+        },
+        index=["flamethrower", "thunder-punch", "growl", "shadow-rush"],
+    )
+    bits = damaging_move_type_bits(moves)
+    assert sorted(bits) == ["flamethrower", "thunder-punch"]
+
+    masks = process_move_type_masks(
+        learnset(
+            ("flamethrower", ["red-blue", "x-y"]),
+            ("thunder-punch", ["x-y"]),
+            ("growl", ["red-blue"]),
+        ),
+        bits,
+    )
+    assert masks == {
+        "red-blue": types_to_mask(["fire"]),
+        "x-y": types_to_mask(["fire", "electric"]),
+    }
+    assert mask_to_types(masks["x-y"]) == ["fire", "electric"]
+    assert sorted(coverage_from_mask(masks["x-y"])) == [
+        "bug",
+        "flying",
+        "grass",
+        "ice",
+        "steel",
+        "water",
+    ]
+
+
+def test_learnset_mask_accepts_nullable_parquet_values():
+    fire = types_to_mask(["fire"])
+    profile = {"move_type_mask": float(fire), "move_type_masks": {"x-y": None}}
+    assert _learnset_attack_mask(profile, None) == fire
+    assert _learnset_attack_mask(profile, "x-y") == 0
+    assert _learnset_attack_mask({"move_type_mask": None}, None) == 0
+    assert _learnset_attack_mask({"types": ["fire"]}, None) == 0
+    assert coverage_from_mask(None) == mask_to_types(None) == []
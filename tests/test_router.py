@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+
+import dataset.utils
+from agents.router import route_simple_question
+
+
+def pokemon(id, types, genus, entries, **columns):
+    row = {
+        "id": id,
+        "types": types,
+        "genus": genus,
+        "evolves_from": None,
+        "pokedex_entries": entries,
+        "weak_to_4x": [],
+        "weak_to_2x": [],
+        "resists_4x": [],
+        "resists_2x": [],
+        "immune_to": [],
+        "abilities": [{"name": "levitate", "is_hidden": False}],
+    }
+    row.update({col: 80 for col in ("base_hp", "base_attack", "base_defense")})
+    row.update({col: 90 for col in ("base_special_attack", "base_special_defense")})
+    row["base_speed"] = 100
+    row.update(columns)
+    return row
+
+
+@pytest.fixture(autouse=True)
+def dataset_rows(monkeypatch):
+    rows = {
+        "gengar": pokemon(
+            94,
+            ["ghost", "poison"],
+            "Shadow Pokémon",
+            {"red": "Gengar"},
+            weak_to_2x=["ground", "psychic", "ghost", "dark"],
+            resists_4x=["bug"],
+            resists_2x=["poison", "grass", "fairy"],
+            immune_to=["normal", "fighting"],
+            abilities=[{"name": "cursed-body", "is_hidden": False}],
+        ),
+        "mr-mime": pokemon(122, ["psychic", "fairy"], "Barrier Pokémon", {"red": "M"}),
+        "giratina-altered": pokemon(
+            487, ["ghost", "dragon"], "Renegade Pokémon", {"x": "G"}
+        ),
+        "giratina-origin": pokemon(
+            10007, ["ghost", "dragon"], "Renegade Pokémon", {"x": "G"}
+        ),
+        "tapu-koko": pokemon(785, ["electric", "fairy"], "Land Spirit Pokémon", {}),
+        "tapu-lele": pokemon(786, ["psychic", "fairy"], "Land Spirit Pokémon", {}),
+        "type-null": pokemon(772, ["normal"], "Synthetic Pokémon", {"sun": "T"}),
+    }
+    df = pd.DataFrame.from_dict(rows, orient="index")
+    monkeypatch.setattr(dataset.utils, "_cached_df", df)
+    monkeypatch.setattr(dataset.utils, "_cached_aliases", None)
+
+
+def test_types():
+    assert route_simple_question("What type is Gengar?") == (
+        "**Gengar** is Ghost/Poison type."
+    )
+    assert route_simple_question("gengar's types") == (
+        "**Gengar** is Ghost/Poison type."
+    )
+
+
+def test_weaknesses():
+    answer = route_simple_question("What is Gengar weak to?")
+    assert "2× weak to: Ground, Psychic, Ghost, Dark" in answer
+    assert "Immune to: Normal, Fighting" in answer
+
+
+def test_resistances():
+    answer = route_simple_question("What does Gengar resist")
+    assert "4× resists: Bug" in answer
+    assert "2× resists: Poison, Grass, Fairy" in answer
+
+
+def test_stats():
+    assert route_simple_question("Gengar base stats") == (
+        "**Gengar** base stats: HP 80 · Atk 80 · Def 80 · SpA 90 · SpD 90 · Spe 100 "
+        "(total 520)"
+    )
+
+
+def test_abilities():
+    assert route_simple_question("What abilities does Gengar have?") == (
+        "**Gengar** abilities: Cursed Body"
+    )
+
+
+@pytest.mark.parametrize(
+    "question, name",
+    [
+        ("What type is Mr. Mime?", "Mr Mime"),
+        ("mr-mime types", "Mr Mime"),
+        ("what type is giratina", "Giratina Altered"),
+        ("Type: Null's type", "Type Null"),
+    ],
+)
+def test_aliases(question, name):
+    assert route_simple_question(question).startswith(f"**{name}**")
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "What type is tapu?",
+        "type types",
+        "What is Gengar weak to in Red?",
+        "Gengar weaknesses in gen 1",
+        "What are Gengar's weaknesses in Let's Go?",
+        "Build me a team around Gengar",
+        "Is Gengar or Alakazam faster?",
+        "What type is Missingno?",
+    ],
+)
+def test_falls_through(question):
+    assert route_simple_question(question) is None
@@ -0,0 +1,65 @@
+import asyncio
+
+from agents.scheduler import ExecuteScheduler
+
+
+def test_later_sessions_queue_behind_earlier_ones():
+    started = []
+
+    async def scenario():
+        scheduler = ExecuteScheduler(max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def query(priority):
+            async def body():
+                started.append(priority)
+                await gate.wait()
+
+            await scheduler.run(priority, body)
+
+        # The first query holds the only slot while the rest queue, newest
+        # session first; each session's plan is also queued out of order.
+        first = asyncio.ensure_future(query((0.0, 0)))
+        await asyncio.sleep(0)
+        queued = [(2.0, 1), (2.0, 0), (1.0, 1), (1.0, 0)]
+        tasks = [asyncio.ensure_future(query(priority)) for priority in queued]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 4
+
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert started == [(0.0, 0), (1.0, 0), (1.0, 1), (2.0, 0), (2.0, 1)]
+    assert (stats["running"], stats["queue_depth"], stats["completed"]) == (0, 0, 5)
+
+
+def test_cancelled_waiter_is_skipped():
+    started = []
+
+    async def scenario():
+        scheduler = ExecuteScheduler(max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def body(name):
+            started.append(name)
+            await gate.wait()
+
+        owner = asyncio.ensure_future(scheduler.run(0, lambda: body("owner")))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(scheduler.run(1, lambda: body("cancelled")))
+        waiter = asyncio.ensure_future(scheduler.run(2, lambda: body("waiter")))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 1
+
+        gate.set()
+        await asyncio.gather(owner, waiter)
+        assert cancelled.cancelled()
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert started == ["owner", "waiter"]
+    assert (stats["running"], stats["queue_depth"]) == (0, 0)
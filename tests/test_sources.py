@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from benchmarks.mock_pokeapi import write_synthetic_dump
+from dataset.crawler import FetchError
+from dataset.http_cache import content_hash
+from dataset.sources import FileSystemSource
+
+
+def test_filesystem_source_reads_dump_layout(tmp_path):
+    write_synthetic_dump(tmp_path, count=4, moves=12)
+    source = FileSystemSource(tmp_path)
+
+    async def scenario():
+        by_id, digest = await source.fetch(
+            None, "https://pokeapi.co/api/v2/pokemon/1/?limit=1"
+        )
+        assert by_id["name"] == "synthmon-1"
+        assert digest == content_hash(by_id)
+
+        by_name, _ = await source.fetch(None, "/api/v2/pokemon/synthmon-2/")
+        assert by_name["id"] == 2
+        encounters, _ = await source.fetch(
+            None, "/api/v2/pokemon/synthmon-2/encounters"
+        )
+        assert isinstance(encounters, list)
+
+        assert await source.fetch(None, "/api/v2/pokemon/missingno/") == (
+            None,
+            content_hash(None),
+        )
+        assert (await source.fetch(None, "/api/v2/pokemon/99/"))[0] is None
+        with pytest.raises(FetchError):
+            await source.fetch(None, "/api/v1/pokemon/1/")
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        source.close()
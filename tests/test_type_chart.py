@@ -0,0 +1,62 @@
+import pytest
+
+from dataset.type_chart import (
+    calculate_type_defenses,
+    coverage_from_mask,
+    generation_for,
+    type_chart_for,
+    type_matrix,
+    types_to_mask,
+)
+
+
+@pytest.mark.parametrize(
+    "generation, missing",
+    [(1, {"steel", "dark", "fairy"}), (2, {"fairy"}), (5, {"fairy"}), (6, set())],
+)
+def test_era_charts_drop_types_that_did_not_exist(generation, missing):
+    chart = type_chart_for(generation)
+    assert missing.isdisjoint(chart)
+    assert all(missing.isdisjoint(entry["offense"]) for entry in chart.values())
+    assert len(chart) == 18 - len(missing)
+
+
+@pytest.mark.parametrize(
+    "generation, attack, defend, multiplier",
+    [
+        (1, "ghost", "psychic", 0.0),
+        (1, "bug", "poison", 2.0),
+        (1, "poison", "bug", 2.0),
+        (1, "ice", "fire", 1.0),
+        (2, "ghost", "steel", 0.5),
+        (2, "dark", "steel", 0.5),
+        (6, "ghost", "psychic", 2.0),
+        (6, "ghost", "steel", 1.0),
+        (None, "ice", "fire", 0.5),
+    ],
+)
+def test_era_overrides(generation, attack, defend, multiplier):
+    chart = type_chart_for(generation)
+    assert chart[attack]["offense"][defend] == multiplier
+    assert chart[defend]["defense"][attack] == multiplier
+
+
+def test_defenses_follow_the_generation():
+    # Gengar: no Dark type yet in Gen 1, and Bug hit Poison super effectively.
+    gen1 = calculate_type_defenses(["ghost", "poison"], generation_for("red-blue"))
+    modern = calculate_type_defenses(["ghost", "poison"])
+    assert sorted(gen1["weak_to_2x"]) == ["ghost", "ground", "psychic"]
+    assert sorted(modern["weak_to_2x"]) == ["dark", "ghost", "ground", "psychic"]
+    assert "bug" not in gen1["resists_2x"] + gen1["resists_4x"]
+    assert "bug" in modern["resists_4x"]
+    assert generation_for("unknown-version") == generation_for(None) == 9
+
+
+def test_matrix_and_coverage_use_the_era_chart():
+    ghost = list(type_chart_for()).index("ghost")
+    psychic = list(type_chart_for()).index("psychic")
+    assert type_matrix(1)[ghost, psychic] == 0.0
+    assert type_matrix()[ghost, psychic] == 2.0
+    assert type_matrix(1)[:, -1].tolist() == [1.0] * 18
+    assert "fairy" in coverage_from_mask(types_to_mask(["steel"]))
+    assert coverage_from_mask(types_to_mask(["steel"]), 2) == ["rock", "ice"]
@@ -2,9 +2,25 @@ import asyncio
 import json
 from typing import Dict, List, Optional
 from collections import defaultdict
-from dataset.type_chart import fetch_type_chart
-from dataset.utils import load_pokemon_dataset
+from dataset.type_chart import (
+    calculate_type_defenses,
+    calculate_type_offenses,
+    coverage_from_mask,
+    generation_for,
+    mask_to_types,
+    type_chart_for,
+)
+from dataset.utils import get_dataset_version, load_pokemon_dataset
 from resources.enums import VersionGroup
+from tools.utils import AsyncLRUCache, count_cpu
+
+ANALYSIS_CACHE_SIZE = 256
+
+_analysis_cache = AsyncLRUCache(maxsize=ANALYSIS_CACHE_SIZE)
+
+
+def analysis_cache_stats() -> Dict[str, int]:
+    return _analysis_cache.stats()
 
 
 async def analyse_pokemon_team(
@@ -16,13 +32,36 @@ async def analyse_pokemon_team(
 
     Args:
         pokemon_names (List[str]): List of Pokémon names to analyze.
-        game_version (VersionGroup, optional): Game version to extract strategic role tags.
+        game_version (VersionGroup, optional): Game version used for strategic role tags, learnable
+                                               move coverage and that generation's type chart.
 
     Returns:
         str: JSON string containing the analysis summary.
     """
+    members = sorted(name.lower().strip() for name in pokemon_names)
+    version = (
+        game_version.value if isinstance(game_version, VersionGroup) else game_version
+    )
+    key = (tuple(members), version, get_dataset_version())
+
+    return await _analysis_cache.get_or_compute(
+        key, lambda: asyncio.to_thread(_analyse_team, members, version)
+    )
+
+
+def _learnset_attack_mask(profile, game_version: Optional[str]) -> int:
+    if "move_type_mask" not in profile:
+        return 0
+    # Nullable struct fields come back from parquet as floats or None.
+    if game_version:
+        return int((profile["move_type_masks"] or {}).get(game_version) or 0)
+    return int(profile["move_type_mask"] or 0)
+
+
+@count_cpu
+def _analyse_team(members: List[str], game_version: Optional[str]) -> str:
     df = load_pokemon_dataset()
-    df = df[df.index.isin([name.lower() for name in pokemon_names])]
+    df = df[df.index.isin(members)]
 
     pokemon_profiles = {}
     type_counts = defaultdict(int)
@@ -36,44 +75,59 @@ async def analyse_pokemon_team(
     strategic_counts = defaultdict(int)
     weakness_counts = defaultdict(int)
 
-    all_types = set(fetch_type_chart().keys())
+    # The stored matchup columns use the modern chart; older games derive theirs.
+    generation = generation_for(game_version) if game_version else None
+    all_types = set(type_chart_for(generation).keys())
 
     for name, profile in df.iterrows():
-        for t in profile["resists_2x"]:
+        if generation:
+            offense = calculate_type_offenses(profile["types"], generation)
+            defense = calculate_type_defenses(profile["types"], generation)
+        else:
+            offense = {
+                "super_effective_against": profile["super_effective_against"],
+                "not_very_effective_against": profile["not_very_effective_against"],
+                "no_effect_against": profile["no_effect_against"],
+            }
+            defense = {
+                "immune_to": profile["immune_to"],
+                "resists_4x": profile["resists_4x"],
+                "resists_2x": profile["resists_2x"],
+                "weak_to_2x": profile["weak_to_2x"],
+                "weak_to_4x": profile["weak_to_4x"],
+            }
+
+        for t in defense["resists_2x"]:
             resistances_total[t] += 1
             resistances_set.add(t)
-        for t in profile["resists_4x"]:
+        for t in defense["resists_4x"]:
             resistances_total[t] += 1
             resistances_set.add(t)
-        for t in profile["immune_to"]:
+        for t in defense["immune_to"]:
             resistances_total[t] += 1
             resistances_set.add(t)
 
-        for t in profile["weak_to_2x"]:
+        for t in defense["weak_to_2x"]:
             weakness_counts[t] += 1
             top_threats[t] = max(top_threats.get(t, 0.0), 2.0)
-        for t in profile["weak_to_4x"]:
+        for t in defense["weak_to_4x"]:
             weakness_counts[t] += 1
             top_threats[t] = 4.0
 
-        game_moves = profile["moves"].get(game_version, {})
+        game_moves = profile["moves"].get(game_version) or {}
         tags = game_moves.get("strategic_tags", [])
         for tag in tags:
             strategic_counts[tag] += 1
 
-        offense = {
-            "super_effective_against": profile["super_effective_against"],
-            "not_very_effective_against": profile["not_very_effective_against"],
-            "no_effect_against": profile["no_effect_against"],
-        }
-
-        defense = {
-            "immune_to": profile["immune_to"],
-            "resists_4x": profile["resists_4x"],
-            "resists_2x": profile["resists_2x"],
-            "weak_to_2x": profile["weak_to_2x"],
-            "weak_to_4x": profile["weak_to_4x"],
-        }
+        attack_mask = _learnset_attack_mask(profile, game_version)
+        if attack_mask:
+            offense["move_attack_types"] = mask_to_types(attack_mask)
+            offense["move_super_effective_against"] = coverage_from_mask(
+                attack_mask, generation
+            )
+            coverage = offense["move_super_effective_against"]
+        else:
+            coverage = offense["super_effective_against"]
 
         roles = profile["roles"]
         speed = profile["speed_tier"]
@@ -84,7 +138,7 @@ async def analyse_pokemon_team(
             role_counts[r] += 1
         speed_counts[speed] += 1
 
-        for t in offense["super_effective_against"]:
+        for t in coverage:
             coverage_map[t].append(name)
             offense_total_types.add(t)
 
@@ -103,7 +157,7 @@ async def analyse_pokemon_team(
 
     analysis = {
         "team_summary": {
-            "size": len(pokemon_names),
+            "size": len(members),
             "types": dict(type_counts),
             "role_distribution": dict(role_counts),
             "speed_distribution": dict(speed_counts),
@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from dataset.utils import SingleFlight, get_dataset_version
+
+TOOL_CACHE_SIZE = 1024
+WEB_SEARCH_TTL = 6 * 60 * 60
+
+
+class MemoryBackend:
+    """Bounded in-process LRU of tool results, with optional expiry per entry."""
+
+    def __init__(self, maxsize: int = TOOL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Tuple[Any, Optional[float]]] = OrderedDict()
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        if key not in self._data:
+            return False, None
+        value, expires = self._data[key]
+        if expires is not None and expires < time.time():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (value, time.time() + ttl if ttl else None)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+class DiskBackend:
+    """Tool results as one JSON file per key, shared across processes and restarts."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Tuple[bool, Any]:
+        try:
+            with self._path(key).open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False, None
+        if entry["expires"] is not None and entry["expires"] < time.time():
+            return False, None
+        return True, entry["value"]
+
+    def _write(self, key: str, value: Any, ttl: Optional[float]):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"value": value, "expires": time.time() + ttl if ttl else None}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    return value
+
+
+class ToolCache:
+    """Caches tool results across sessions, keyed by tool name, canonical
+    arguments and dataset version.
+
+    Concurrent identical calls share one in-flight computation.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self._inflight = SingleFlight()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "coalesced": 0}
+        )
+
+    def key(self, name: str, arguments: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [name, _canonical(arguments), get_dataset_version()],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def wrap(self, tool, ttl: Optional[float] = None):
+        """Returns a cached version of an async tool with the same signature
+        and docstring, so agents see an identical tool schema.
+        """
+        signature = inspect.signature(tool)
+        name = tool.__name__
+
+        @functools.wraps(tool)
+        async def cached(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = self.key(name, bound.arguments)
+            stats = self._stats[name]
+
+            found, value = await self.backend.get(key)
+            if found:
+                stats["hits"] += 1
+                return value
+
+            if key in self._inflight:
+                stats["coalesced"] += 1
+            else:
+                stats["misses"] += 1
+            return await self._inflight.run(
+                key, lambda: self._compute(key, tool(*args, **kwargs), ttl)
+            )
+
+        return cached
+
+    async def _compute(self, key: str, call, ttl: Optional[float]) -> Any:
+        value = await call
+        await self.backend.set(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for name, stats in self._stats.items():
+            lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+            served = stats["hits"] + stats["coalesced"]
+            report[name] = {**stats, "hit_rate": served / lookups if lookups else 0.0}
+        return report
+
+
+def _default_backend():
+    cache_dir = os.getenv("TOOL_CACHE_DIR")
+    return DiskBackend(cache_dir) if cache_dir else MemoryBackend()
+
+
+TOOL_CACHE = ToolCache(_default_backend())
+
+
+def tool_cache_stats() -> Dict[str, Dict[str, float]]:
+    return TOOL_CACHE.stats()
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from dataset.type_chart import (
+    fetch_type_chart,
+    generation_for,
+    type_chart_for,
+    type_index_arrays,
+    type_matrix,
+)
+from dataset.utils import load_move_table, load_pokemon_dataset
+from resources.enums import VersionGroup
+
+MAX_LIMIT = 50
+DEFAULT_IV = 31
+DEFAULT_EV = 0
+STAB_MULTIPLIER = 1.5
+MIN_ROLL = 0.85
+
+# Before the Gen 4 physical/special split, the move's type decided its category.
+SPECIAL_TYPES_BEFORE_SPLIT = {
+    "fire",
+    "water",
+    "grass",
+    "electric",
+    "psychic",
+    "ice",
+    "dragon",
+    "dark",
+}
+
+STAT_COLUMNS = {
+    "physical": ("base_attack", "base_defense"),
+    "special": ("base_special_attack", "base_special_defense"),
+}
+
+
+def scale_stat(base, level, iv=DEFAULT_IV, ev=DEFAULT_EV):
+    return np.floor((2 * base + iv + ev // 4) * level / 100) + 5
+
+
+def scale_hp(base, level, iv=DEFAULT_IV, ev=DEFAULT_EV):
+    return np.floor((2 * base + iv + ev // 4) * level / 100) + level + 10
+
+
+def damage_range(level, power, attack, defense, stab, effectiveness):
+    """Minimum and maximum damage rolls, elementwise over any broadcastable inputs.
+
+    Follows the Gen 3+ formula: base damage, then the random roll, then STAB,
+    then each of the defender's type multipliers in `effectiveness`, flooring
+    after every step as the games do.
+    """
+    base = (
+        np.floor(np.floor(np.floor(2 * level / 5 + 2) * power * attack / defense) / 50)
+        + 2
+    )
+    low, high = np.floor(base * MIN_ROLL), base
+    for multiplier in (stab, *effectiveness):
+        low, high = np.floor(low * multiplier), np.floor(high * multiplier)
+    return low, high
+
+
+def _normalize_move_name(move: str) -> str:
+    return move.lower().strip().replace(" ", "-")
+
+
+def _ko_verdict(min_hits: int, max_hits: int) -> str:
+    if max_hits == 1:
+        return "guaranteed OHKO"
+    if min_hits == 1:
+        return "possible OHKO"
+    if min_hits == max_hits:
+        return f"{min_hits}HKO"
+    return f"{min_hits}-{max_hits}HKO"
+
+
+async def calculate_damage(
+    attacker: str,
+    move: str,
+    defenders: Optional[List[str]] = None,
+    level: int = 50,
+    defender_level: Optional[int] = None,
+    game_version: Optional[VersionGroup] = None,
+) -> str:
+    """
+    Calculates the damage range of one attacker's move against specific defenders or the whole Pokédex.
+    Use this to answer questions such as "can Garchomp OHKO Salamence with Dragon Claw" from base stats,
+    the type chart, STAB and level. Assumes perfect IVs, no EVs, neutral natures, and no items, abilities,
+    weather or critical hits.
+
+    Args:
+        attacker (str): Name of the attacking Pokémon (e.g., 'garchomp').
+        move (str): Name of a damaging move with fixed base power (e.g., 'dragon-claw' or 'Dragon Claw').
+        defenders (List[str], optional): Defending Pokémon to evaluate. If omitted, every Pokémon in the
+                                         dataset is evaluated and the most damaged are returned first.
+        level (int, optional): Level of the attacker. Defaults to 50.
+        defender_level (int, optional): Level of the defenders. Defaults to the attacker's level.
+        game_version (VersionGroup, optional): Game version whose type chart and physical/special rules apply.
+                                               Defaults to the latest games.
+
+    Returns:
+        str: A table with, per defender, the type multiplier, min/max damage, min/max percentage of
+             the defender's HP and a KO verdict (e.g., 'guaranteed OHKO', '2-3HKO').
+    """
+    df = load_pokemon_dataset()
+    attacker = attacker.lower().strip()
+    if attacker not in df.index:
+        return f"Attacker '{attacker}' not found."
+
+    moves = load_move_table()
+    move_name = _normalize_move_name(move)
+    if move_name not in moves.index:
+        return f"Move '{move}' not found."
+
+    move_row = moves.loc[move_name]
+    damage_class = move_row["damage_class"]
+    if damage_class not in STAT_COLUMNS or pd.isna(move_row["power"]):
+        return f"Move '{move_name}' has no fixed base power, so its damage cannot be calculated."
+    generation = generation_for(game_version)
+    if move_row["type"] not in type_chart_for(generation):
+        return f"Move '{move_name}' has type '{move_row['type']}', which is not on the type chart for this game."
+    if generation < 4:
+        damage_class = (
+            "special" if move_row["type"] in SPECIAL_TYPES_BEFORE_SPLIT else "physical"
+        )
+
+    if defenders:
+        names = [name.lower().strip() for name in defenders]
+        missing = [name for name in names if name not in df.index]
+        targets = df.loc[[name for name in names if name in df.index]]
+    else:
+        missing = []
+        targets = df
+
+    attacker_row = df.loc[attacker]
+    attack_column, defense_column = STAT_COLUMNS[damage_class]
+    defender_level = defender_level or level
+
+    attack = scale_stat(attacker_row[attack_column], level)
+    defense = scale_stat(targets[defense_column].to_numpy(), defender_level)
+    hp = scale_hp(targets["base_hp"].to_numpy(), defender_level)
+
+    move_type = move_row["type"]
+    move_index = list(fetch_type_chart()).index(move_type)
+    primary, secondary = type_index_arrays(targets["types"])
+    matrix = type_matrix(generation)
+    per_type = (matrix[move_index, primary], matrix[move_index, secondary])
+    effectiveness = per_type[0] * per_type[1]
+    stab = STAB_MULTIPLIER if move_type in attacker_row["types"] else 1.0
+
+    low, high = damage_range(
+        level, int(move_row["power"]), attack, defense, stab, per_type
+    )
+    min_hits = np.ceil(hp / np.maximum(high, 1)).astype(int)
+    max_hits = np.ceil(hp / np.maximum(low, 1)).astype(int)
+
+    results = pd.DataFrame(
+        {
+            "name": targets.index,
+            "types": targets["types"].to_numpy(),
+            "multiplier": effectiveness,
+            "min_damage": low.astype(int),
+            "max_damage": high.astype(int),
+            "min_pct": np.round(100 * low / hp, 1),
+            "max_pct": np.round(100 * high / hp, 1),
+            "verdict": [
+                "immune" if eff == 0 else _ko_verdict(lo, hi)
+                for eff, lo, hi in zip(effectiveness, min_hits, max_hits)
+            ],
+        }
+    )
+
+    if not defenders:
+        results = results.sort_values("min_pct", ascending=False).head(MAX_LIMIT)
+
+    header = (
+        f"{attacker} (Lv. {level}) using {move_name} "
+        f"({move_type}, {damage_class}, power {int(move_row['power'])}"
+        f"{', STAB' if stab > 1 else ''}) vs Lv. {defender_level} defenders"
+    )
+    if missing:
+        header += f"\nNot found: {', '.join(missing)}"
+    return header + "\n" + results.to_string(index=False)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from dataset.type_chart import (
+    fetch_type_chart,
+    generation_for,
+    type_index_arrays,
+    type_matrix,
+)
+from dataset.utils import load_pokemon_dataset
+from resources.enums import VersionGroup
+
+MAX_LIMIT = 50
+STAB_MULTIPLIER = 1.5
+SPEED_WEIGHT = 0.5
+# Floor for log2 scores, so immunities count as a strong but finite swing.
+MIN_MULTIPLIER = 0.25
+
+
+def _attack_type_matrix(
+    df: pd.DataFrame, game_version: Optional[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Boolean (candidates x types) matrices of usable attack types and STAB types.
+
+    Uses the learnset bitmask when available and falls back to STAB types.
+    """
+    num_types = len(fetch_type_chart())
+    if "move_type_mask" in df.columns:
+        if game_version:
+            masks = df["move_type_masks"].apply(
+                lambda mv: (mv or {}).get(game_version) or 0
+            )
+        else:
+            masks = df["move_type_mask"].fillna(0)
+        masks = masks.to_numpy(dtype=np.int64)
+    else:
+        masks = np.zeros(len(df), dtype=np.int64)
+
+    attack = ((masks[:, None] >> np.arange(num_types)) & 1).astype(bool)
+
+    primary, secondary = type_index_arrays(df["types"])
+    stab = np.zeros((len(df), num_types + 1), dtype=bool)
+    stab[np.arange(len(df)), primary] = True
+    stab[np.arange(len(df)), secondary] = True
+    stab = stab[:, :num_types]
+
+    no_learnset = ~attack.any(axis=1)
+    attack[no_learnset] = stab[no_learnset]
+    return attack, stab
+
+
+def _names(opponents: List[str], mask: np.ndarray) -> List[str]:
+    return [name for name, hit in zip(opponents, mask) if hit]
+
+
+async def find_counters(
+    opponents: List[str],
+    game_version: Optional[VersionGroup] = None,
+    exclude_legendary: bool = False,
+    limit: int = 15,
+) -> str:
+    """
+    Ranks every Pokémon in the dataset as a counter to a roster of opponent Pokémon (e.g., a Gym Leader or
+    Elite Four member's team). Each candidate is scored against each opponent on how well it resists the
+    opponent's STAB types, how hard its learnable attacking types hit the opponent, and whether it is faster.
+
+    Args:
+        opponents (List[str]): Names of the opposing Pokémon (e.g., ['altaria', 'flygon', 'salamence']).
+        game_version (VersionGroup, optional): Restricts candidates to Pokémon with moves in that game and uses
+                                               its learnsets and type chart.
+        exclude_legendary (bool, optional): Whether to leave legendary and mythical Pokémon out of the ranking.
+        limit (int, optional): Number of counters to return. Defaults to 15, at most 50.
+
+    Returns:
+        str: A ranked table of counters with their score and, per candidate, which opponents it resists,
+             hits super-effectively, outspeeds, and is weak to.
+    """
+    df = load_pokemon_dataset()
+    names = [name.lower().strip() for name in opponents]
+    missing = [name for name in names if name not in df.index]
+    names = [name for name in names if name in df.index]
+    if not names:
+        return f"None of the opponents were found: {', '.join(missing)}"
+
+    generation = generation_for(game_version)
+    matrix = type_matrix(generation)
+    num_types = len(fetch_type_chart())
+
+    foes = df.loc[names]
+    candidates = df[~df.index.isin(names)]
+    if game_version:
+        candidates = candidates[
+            candidates["moves"].apply(lambda mv: bool(mv.get(game_version)))
+        ]
+    if exclude_legendary:
+        candidates = candidates[
+            ~(candidates["is_legendary"] | candidates["is_mythical"])
+        ]
+    if candidates.empty:
+        return "No candidate Pokémon are available for this game."
+
+    # Defensive multipliers against every attacking type: (rows x types).
+    c1, c2 = type_index_arrays(candidates["types"])
+    o1, o2 = type_index_arrays(foes["types"])
+    candidate_defense = matrix[:, c1].T * matrix[:, c2].T
+    foe_defense = matrix[:, o1].T * matrix[:, o2].T
+
+    # Worst STAB multiplier each opponent lands on each candidate: (N x K).
+    foe_stab = np.zeros((len(foes), num_types + 1), dtype=bool)
+    foe_stab[np.arange(len(foes)), o1] = True
+    foe_stab[np.arange(len(foes)), o2] = True
+    foe_stab = foe_stab[:, :num_types]
+    incoming = np.where(foe_stab[None, :, :], candidate_defense[:, None, :], 0.0).max(
+        axis=-1
+    )
+
+    # Best multiplier each candidate lands on each opponent, STAB included: (N x K).
+    attack, stab = _attack_type_matrix(candidates, game_version)
+    attack_power = attack * np.where(stab, STAB_MULTIPLIER, 1.0)
+    outgoing = (attack_power[:, None, :] * foe_defense[None, :, :]).max(axis=-1)
+    type_outgoing = (attack[:, None, :] * foe_defense[None, :, :]).max(axis=-1)
+
+    speed_diff = (
+        candidates["base_speed"].to_numpy()[:, None]
+        - foes["base_speed"].to_numpy()[None, :]
+    )
+
+    score = (
+        np.log2(np.maximum(outgoing, MIN_MULTIPLIER))
+        - np.log2(np.maximum(incoming, MIN_MULTIPLIER))
+        + SPEED_WEIGHT * np.sign(speed_diff)
+    ).mean(axis=1)
+
+    order = np.argsort(-score, kind="stable")[: min(limit, MAX_LIMIT)]
+    foe_names = list(foes.index)
+    results = pd.DataFrame(
+        {
+            "name": candidates.index[order],
+            "types": candidates["types"].to_numpy()[order],
+            "score": np.round(score[order], 2),
+            "resists": [_names(foe_names, incoming[i] < 1) for i in order],
+            "hits_super_effectively": [
+                _names(foe_names, type_outgoing[i] >= 2) for i in order
+            ],
+            "outspeeds": [_names(foe_names, speed_diff[i] > 0) for i in order],
+            "weak_to": [_names(foe_names, incoming[i] > 1) for i in order],
+        }
+    )
+
+    header = f"Counters for {', '.join(foe_names)}"
+    if game_version:
+        header += f" in {getattr(game_version, 'value', game_version)}"
+    if missing:
+        header += f"\nNot found: {', '.join(missing)}"
+    return header + "\n" + results.to_string(index=False)
@@ -1,5 +1,12 @@
 from typing import List, Dict, Optional, Any, Literal
-from dataset.utils import load_pokemon_dataset
+from collections import defaultdict
+import pyarrow as pa
+import pyarrow.compute as pc
+from dataset.utils import (
+    load_pokemon_dataset,
+    load_pokemon_locations,
+    load_pokemon_lore,
+)
 from resources.enums import VersionGroup
 from enum import Enum
 from tools.utils import pretty_print
@@ -14,6 +21,34 @@ class DataGroup(str, Enum):
     LORE = "lore"
 
 
+# Served from the normalized long tables rather than the full_profile JSON.
+TABLE_GROUPS = {"locations", "lore"}
+
+
+def _rows_for(table: pa.Table, name: str, version: Optional[str] = None) -> pa.Table:
+    mask = pc.equal(table["pokemon"], name)
+    if version:
+        mask = pc.and_(mask, pc.equal(table["version"], version))
+    return table.filter(mask)
+
+
+def _encounter_locations(
+    name: str, version: Optional[str] = None
+) -> Dict[str, List[str]]:
+    rows = _rows_for(load_pokemon_locations(), name, version)
+    locations = defaultdict(list)
+    for row_version, location in zip(
+        rows["version"].to_pylist(), rows["location"].to_pylist()
+    ):
+        locations[row_version].append(location)
+    return dict(locations)
+
+
+def _pokedex_entries(name: str) -> Dict[str, str]:
+    rows = _rows_for(load_pokemon_lore(), name)
+    return dict(zip(rows["version"].to_pylist(), rows["text"].to_pylist()))
+
+
 async def get_pokemon_profiles(
     names: List[str],
     data_groups: List[DataGroup],
@@ -42,6 +77,8 @@ async def get_pokemon_profiles(
     """
     df = load_pokemon_dataset()
     data_groups = data_groups or ["profile"]
+    groups = {getattr(group, "value", group) for group in data_groups}
+    version = getattr(game_version, "value", game_version)
 
     results: Dict[str, Any] = {}
 
@@ -51,17 +88,22 @@ async def get_pokemon_profiles(
             results[name] = {"name": name, "error": "Pokémon not found"}
             continue
 
-        row = df.loc[name]
-        profile = json.loads(row["full_profile"])
+        profile = {}
+        if groups - TABLE_GROUPS:
+            profile = json.loads(df.loc[name, "full_profile"])
 
-        if game_version:
-            profile["moves"] = {game_version: profile["moves"].get(game_version, {})}
-            profile["locations"] = {
-                game_version: profile["locations"]
-                .get("encounter_locations", {})
-                .get(game_version, {})
-            }
+        if version:
+            if "moves" in profile:
+                profile["moves"] = {version: profile["moves"].get(version, {})}
+            if "locations" in groups:
+                profile["locations"] = {
+                    version: _encounter_locations(name, version).get(version, {})
+                }
+        elif "locations" in groups:
+            profile["locations"] = {"encounter_locations": _encounter_locations(name)}
+        if "lore" in groups:
+            profile["lore"] = {"pokedex_entries": _pokedex_entries(name)}
 
-        results[name] = {k: v for k, v in profile.items() if k in set(data_groups)}
+        results[name] = {k: v for k, v in profile.items() if k in groups}
 
     return json.dumps(results, indent=2, ensure_ascii=False)
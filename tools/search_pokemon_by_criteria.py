@@ -1,7 +1,10 @@
+import pyarrow as pa
+import pyarrow.compute as pc
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from dataset.utils import load_pokemon_dataset
+from typing import List, Optional, Set
+from dataset.utils import load_pokemon_dataset, load_pokemon_moves, move_slug
+from dataset.type_chart import calculate_type_defenses, generation_for, types_to_mask
 from resources.enums import (
     VersionGroup,
     PokemonType,
@@ -78,6 +81,25 @@ class GrowthRate(str, Enum):
 MAX_LIMIT = 100
 
 
+def _pokemon_learning_all(
+    moves: List[str], game_version: Optional[VersionGroup] = None
+) -> Set[str]:
+    """Names of Pokémon that learn every one of `moves`, scanned from the
+    normalized learnset table with Arrow compute filters.
+    """
+    table = load_pokemon_moves()
+    slugs = sorted({move_slug(move) for move in moves})
+    mask = pc.is_in(table["move"], value_set=pa.array(slugs))
+    if game_version:
+        version = getattr(game_version, "value", game_version)
+        mask = pc.and_(mask, pc.equal(table["version_group"], version))
+    learned = (
+        table.filter(mask).group_by("pokemon").aggregate([("move", "count_distinct")])
+    )
+    learned = learned.filter(pc.equal(learned["move_count_distinct"], len(slugs)))
+    return set(learned["pokemon"].to_pylist())
+
+
 async def search_pokemon_by_criteria(
     include_types: Optional[List[PokemonType]] = None,
     exclude_types: Optional[List[PokemonType]] = None,
@@ -90,6 +112,8 @@ async def search_pokemon_by_criteria(
     required_resists: Optional[List[PokemonType]] = None,
     required_immunities: Optional[List[PokemonType]] = None,
     exclude_weaknesses: Optional[List[PokemonType]] = None,
+    learns_attack_types: Optional[List[PokemonType]] = None,
+    learns_moves: Optional[List[str]] = None,
     game_version: Optional[VersionGroup] = None,
     is_legendary: Optional[bool] = None,
     is_mythical: Optional[bool] = None,
@@ -117,7 +141,12 @@ async def search_pokemon_by_criteria(
         required_resists (List[PokemonType], optional): Return only Pokémon that resist **all** of the specified types.
         required_immunities (List[PokemonType], optional): Return only Pokémon immune to **all** of the given types.
         exclude_weaknesses (List[PokemonType], optional): Exclude Pokémon that are weak to **any** of the specified types.
-        game_version (VersionGroup, optional): The game version used to evaluate strategic tags from movesets.
+        learns_attack_types (List[PokemonType], optional): Return only Pokémon that can learn damaging moves of **all** of
+                                                           the specified types. Uses `game_version` when given.
+        learns_moves (List[str], optional): Return only Pokémon that can learn **all** of the named moves by any method
+                                            (e.g., ['surf', 'thunder-punch']). Uses `game_version` when given.
+        game_version (VersionGroup, optional): The game version used to evaluate strategic tags, learnable moves and move types.
+                                               Resistance, immunity and weakness filters also use that generation's type chart.
         is_legendary (bool, optional): Whether to include only legendary Pokémon (True), or exclude them (False).
         is_mythical (bool, optional): Whether to include only mythical Pokémon (True), or exclude them (False).
         is_baby (bool, optional): Whether to include only baby Pokémon (True), or exclude them (False).
@@ -161,6 +190,22 @@ async def search_pokemon_by_criteria(
             )
         ]
 
+    if (
+        not df.empty
+        and game_version
+        and (required_resists or required_immunities or exclude_weaknesses)
+    ):
+        generation = generation_for(game_version)
+        defenses = df["types"].apply(lambda t: calculate_type_defenses(t, generation))
+        for column in [
+            "resists_2x",
+            "resists_4x",
+            "immune_to",
+            "weak_to_2x",
+            "weak_to_4x",
+        ]:
+            df[column] = defenses.apply(lambda d: d[column])
+
     if not df.empty and required_resists:
         df = df[
             df["resists_2x"].apply(lambda x: all(t in x for t in required_resists))
@@ -178,6 +223,20 @@ async def search_pokemon_by_criteria(
             & ~df["weak_to_4x"].apply(lambda x: any(t in x for t in exclude_weaknesses))
         ]
 
+    if not df.empty and learns_attack_types and "move_type_mask" in df.columns:
+        required = types_to_mask(learns_attack_types)
+        if game_version:
+            masks = df["move_type_masks"].apply(
+                lambda mv: (mv or {}).get(game_version) or 0
+            )
+        else:
+            masks = df["move_type_mask"].fillna(0)
+        masks = masks.astype("int64")
+        df = df[(masks & required) == required]
+
+    if not df.empty and learns_moves:
+        df = df[df["name"].isin(_pokemon_learning_all(learns_moves, game_version))]
+
     if not df.empty and is_legendary is not None:
         df = df[df["is_legendary"] == is_legendary]
 
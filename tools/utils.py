@@ -1,4 +1,14 @@
+import contextlib
+import functools
+import inspect
 import json
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+from dataset.utils import SingleFlight
+
 
 def pretty_print(data):
     if hasattr(data, "model_dump"):
@@ -6,3 +16,131 @@ def pretty_print(data):
     elif isinstance(data, list) and all(hasattr(item, "model_dump") for item in data):
         data = [item.model_dump() for item in data]
     print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+class AsyncLRUCache:
+    """Bounded LRU cache for coroutine results with single-flight misses.
+
+    Concurrent lookups of a key that is still being computed await the same
+    task instead of starting a second computation.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._inflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return await self._inflight.run(key, lambda: self._compute(key, compute))
+
+    async def _compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = await compute()
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+# CPU seconds charged to the running tool call, shared with the tasks and
+# worker threads it starts since both copy the context.
+_tool_cpu: ContextVar[Optional[list]] = ContextVar("tool_cpu", default=None)
+
+
+@contextlib.contextmanager
+def cpu_meter() -> Iterator[list]:
+    """Collects, in a one-item list, the CPU seconds `count_cpu` charges
+    while the block runs.
+    """
+    cpu = [0.0]
+    token = _tool_cpu.set(cpu)
+    try:
+        yield cpu
+    finally:
+        _tool_cpu.reset(token)
+
+
+def _charge_cpu(seconds: float):
+    cpu = _tool_cpu.get()
+    if cpu is not None:
+        cpu[0] += seconds
+
+
+class _CpuTimed:
+    """Awaits a coroutine, charging the thread CPU time of each of its steps
+    to the running tool call. Work interleaved at its awaits is not counted.
+    """
+
+    def __init__(self, coro):
+        self.coro = coro
+
+    def __await__(self):
+        send, message = self.coro.send, None
+        while True:
+            start = time.thread_time()
+            try:
+                yielded = send(message)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                _charge_cpu(time.thread_time() - start)
+            try:
+                message, send = (yield yielded), self.coro.send
+            except BaseException as e:
+                message, send = e, self.coro.throw
+
+
+def count_cpu(fn):
+    """Charges the CPU time of a tool body to the tool call running it.
+
+    Coroutine functions are timed one step at a time on the event loop;
+    plain functions, such as work handed to `asyncio.to_thread`, are timed
+    in whichever thread runs them.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def counted(*args, **kwargs):
+            return await _CpuTimed(fn(*args, **kwargs))
+
+    else:
+
+        @functools.wraps(fn)
+        def counted(*args, **kwargs):
+            start = time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _charge_cpu(time.thread_time() - start)
+
+    return counted